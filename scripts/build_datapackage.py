@@ -10,6 +10,21 @@ Usage
 
     >>> uv run scripts/build_datapackage.py # doctest: +SKIP
 
+3. Optionally, infer resources across multiple processes:
+
+    >>> uv run scripts/build_datapackage.py --jobs 4 # doctest: +SKIP
+
+Inferred resources are cached in ``_data/.cache/``, so that only new or changed
+files are re-inferred. Pass ``--no-cache`` to ignore (and rebuild) the cache.
+
+4. Optionally, keep rebuilding while editing ``data/`` or ``_data/datapackage_additions.toml``:
+
+    >>> uv run scripts/build_datapackage.py --watch # doctest: +SKIP
+
+5. Optionally, re-infer only the resources a generator script has just rewritten:
+
+    >>> uv run scripts/build_datapackage.py --only "flights-*.json" # doctest: +SKIP
+
 Related
 -------
 - https://docs.astral.sh/uv/guides/scripts/#declaring-script-dependencies
@@ -27,19 +42,28 @@ Related
 
 from __future__ import annotations
 
+import argparse
+import codecs
 import contextlib
 import copy
 import datetime as dt
-import io
+import fnmatch
+import hashlib
+import itertools
 import json
 import logging
+import math
+import multiprocessing as mp
 import os
 import re
-import subprocess as sp
+import sys
+import time
 import tomllib
 import warnings
 from collections.abc import Mapping, Sequence
-from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache, partial
+from operator import itemgetter
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -78,8 +102,8 @@ from frictionless.resources import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
-    from typing import ClassVar, Literal
+    from collections.abc import Callable, Iterable, Iterator
+    from typing import IO, ClassVar, Literal
 
 
 logging.basicConfig(level=logging.INFO)
@@ -107,9 +131,82 @@ type PythonDataType = (
 )
 
 type OutputFormat = Literal["json", "yaml", "md"]
-type OneOrSeq[T] = T | Sequence[T]
+type InferenceEngine = Literal["frictionless", "polars"]
+type MeasurementKind = Literal["phase", "resource", "merge_schemas"]
 
 ADDITIONS_TOML: LiteralString = "datapackage_additions.toml"
+ADDITIONS_HASH: LiteralString = "additionsHash"
+"""Package property recording the digest of ``ADDITIONS_TOML``, verified by ``check_datapackage.py``."""
+CACHE_DIR: LiteralString = ".cache"
+HASH_CHUNK_SIZE: int = 1024 * 1024
+"""Bytes fed to each digest at a time, by ``hash_file``."""
+JSON_SNIFF_BYTES: int = 64 * 1024
+"""Size of the prefix used to identify the structure of a ``.json`` file."""
+JSON_INFER_ROWS: int = 100
+"""Rows inspected by ``pl.read_json`` when inferring a schema."""
+POLARS_INFER_FULL_BYTES: int = 256 * 1024
+"""Files up to this size have *every* row inspected by the ``"polars"`` engine."""
+POLARS_INFER_ROWS: int = 1_000
+"""Rows inspected by the ``"polars"`` engine, for files larger than ``POLARS_INFER_FULL_BYTES``."""
+IN_MEMORY_FACTOR: int = 20
+"""
+Peak memory per byte of a file that is read at once.
+
+The worst case, measured when decoding ``.json`` into Python objects.
+Reading a ``.json`` file in full with ``polars`` takes ~10x, other formats less.
+"""
+STATS_RANGE_TYPES: frozenset[str] = frozenset({
+    "boolean",
+    "date",
+    "datetime",
+    "integer",
+    "number",
+    "time",
+    "year",
+})
+"""Field types that ``FieldStats`` include a ``min`` and ``max`` for."""
+TEMPORAL_TYPES: frozenset[str] = frozenset({"date", "datetime", "time"})
+"""Field types that ``parse_temporal`` reads from strings."""
+NUMERIC_DTYPES: Mapping[str, pl.DataType] = {
+    "integer": pl.Int64(),
+    "number": pl.Float64(),
+    "year": pl.Int64(),
+}
+"""Field types that ``conform_dtypes`` casts to a single ``polars`` dtype."""
+CATEGORICAL_MAX_DISTINCT: int = 2**16
+"""Most distinct values a ``string`` field may have, to be hinted as ``Categorical``."""
+CATEGORICAL_MAX_RATIO: float = 0.5
+"""Most distinct values per (non-null) value a ``string`` field may have, to be hinted as ``Categorical``."""
+INTEGER_BITS: Sequence[int] = (8, 16, 32, 64)
+"""
+Widths of the signed integer ``dtype`` candidates, narrowest first, as in `shrink_dtype`_.
+
+.. _shrink_dtype:
+    https://docs.pola.rs/api/python/stable/reference/expressions/api/polars.Expr.shrink_dtype.html
+"""
+FLOAT32_MAX_INTEGER: int = 2**24
+"""Largest magnitude below which every integer survives a round trip through ``Float32``."""
+PREVIEW_ROWS: int = 5
+"""Default number of rows in each part of a ``Preview``, for ``--preview``."""
+PREVIEW_SEED: int = 0
+"""Seed for the random rows of a ``Preview``, so that rebuilds are reproducible."""
+WATCH_INTERVAL: float = 1.0
+"""Seconds between each scan for changes, in ``--watch`` mode."""
+TS_COLUMN_TYPES: Mapping[str, str] = {
+    "integer": "integer",
+    "number": "number",
+    "boolean": "boolean",
+    "date": "date",
+    "datetime": "datetime",
+    "year": "integer",
+    "string": "string",
+}
+"""
+Maps `Field Types`_ to the ``ColumnType`` written by ``write_column_types_ts``.
+
+.. _Field Types:
+    https://datapackage.org/standard/table-schema/#field-types
+"""
 NPM_PACKAGE: Literal["package.json"] = "package.json"
 DATAPACKAGE: Literal["datapackage"] = "datapackage"
 
@@ -278,6 +375,63 @@ class ResourceAdapter:
     multi_format_bases: ClassVar[set[str]] = set()
     """Base names that exist in multiple formats."""
 
+    engine: ClassVar[InferenceEngine] = "frictionless"
+    """Library used to infer the schema of ``.csv``, ``.tsv`` and ``.parquet`` files."""
+
+    schema_diff: ClassVar[bool] = False
+    """Report fields where the ``"polars"`` engine disagrees with ``"frictionless"``."""
+
+    field_stats: ClassVar[bool] = False
+    """Add ``rows`` to tabular resources, and ``FieldStats`` to each of their fields."""
+
+    dtype_hints: ClassVar[bool] = False
+    """Add the narrowest ``polars`` ``dtype`` holding every value, to numeric and string fields."""
+
+    preview_rows: ClassVar[int] = 0
+    """Add a ``Preview`` of this many rows (per part) to tabular resources, or ``0`` for none."""
+
+    memory_budget: ClassVar[int | None] = None
+    """
+    Approximate bytes that inferring a single resource may use, or ``None`` for no limit.
+
+    Files that could exceed this when read in full are streamed instead, see ``is_large``.
+    """
+
+    _config: ClassVar[tuple[str, ...]] = (
+        "multi_format_bases",
+        "engine",
+        "schema_diff",
+        "field_stats",
+        "dtype_hints",
+        "preview_rows",
+        "memory_budget",
+    )
+
+    @classmethod
+    def config(cls) -> dict[str, Any]:
+        """Class-level state configured by ``main``, which worker processes must inherit."""
+        return {name: getattr(cls, name) for name in cls._config}
+
+    @classmethod
+    def is_large(cls, source: Path, /) -> bool:
+        """
+        Whether reading ``source`` in full could exceed ``memory_budget``.
+
+        Always true for ``.parquet`` when a budget is set, as the size on disk says
+        little about the size in memory.
+        """
+        if cls.memory_budget is None:
+            return False
+        if source.suffix == ".parquet":
+            return True
+        return source.stat().st_size * IN_MEMORY_FACTOR > cls.memory_budget
+
+    @classmethod
+    def batch_bytes(cls) -> int:
+        """Size of the part of a file that can be read at once, within ``memory_budget``."""
+        budget = cls.memory_budget or 0
+        return max(budget // IN_MEMORY_FACTOR, JSON_SNIFF_BYTES)
+
     @classmethod
     def is_supported(cls, source: Path, /) -> bool:
         return source.suffix in {
@@ -294,7 +448,7 @@ class ResourceAdapter:
     def from_path(cls, source: Path, /) -> Resource:
         match source.suffix:
             case ".csv" | ".tsv" | ".parquet":
-                return cls.from_tabular_safe(source)
+                return cls.from_tabular(source)
             case ".json":
                 return cls.from_json(source)
             case ".png" | ".jpg":
@@ -317,27 +471,149 @@ class ResourceAdapter:
             **file_meta, format=".arrow", schema=frame_to_schema(pl.scan_ipc(source))
         )
 
+    @classmethod
+    def from_tabular(cls, source: Path, /) -> Resource:
+        if source.suffix == ".parquet" and cls.is_large(source):
+            return cls.from_parquet_sample(source)
+        if cls.engine == "polars":
+            return cls.from_tabular_polars(source)
+        return cls.from_tabular_safe(source)
+
     @classmethod
     def from_tabular_safe(cls, source: Path, /) -> Resource:
         return cls.infer_as(source, TableResource)
 
+    @classmethod
+    def from_tabular_polars(cls, source: Path, /) -> Resource:
+        """
+        Infer the schema with a `polars`_ scan, leaving only the file-level details to ``frictionless``.
+
+        Smaller files are inspected in full, larger ones up to ``POLARS_INFER_ROWS``.
+
+        .. _polars:
+            https://docs.pola.rs/user-guide/io/csv/
+        """
+        n_bytes = cls.batch_bytes() if cls.is_large(source) else None
+        schema = frame_to_schema(scan_tabular(source, n_bytes=n_bytes))
+        resource = TableResource(**cls._extract_file_parts(source), schema=schema)
+        resource.infer()
+        if cls.schema_diff and (
+            diff := diff_schemas(cls.from_tabular_safe(source).schema, schema)
+        ):
+            msg = f"Inference engines disagree for {source.name!r}:\n  " + "\n  ".join(
+                diff
+            )
+            logger.warning(msg)
+        return resource
+
+    @classmethod
+    def from_parquet_sample(cls, source: Path, /) -> Resource:
+        """
+        Detect the schema from the first rows of a ``.parquet`` file.
+
+        Gives the same result as ``from_tabular_safe``, which detects types from the
+        same sample, but only reads the first row group rather than the entire file.
+        """
+        head = pl.scan_parquet(source).head(fl.settings.DEFAULT_SAMPLE_SIZE).collect()
+        fragment = [list(row) for row in head.iter_rows()]
+        return TableResource(
+            **cls._extract_file_parts(source),
+            format="parquet",
+            mediatype="application/parquet",
+            schema=fl.Detector().detect_schema(fragment, labels=head.columns),
+        )
+
     @classmethod
     def from_image(cls, source: Path, /) -> Resource:
         return cls.infer_as(source, Resource)
 
     @classmethod
     def from_json(cls, source: Path, /) -> Resource:
-        """Identifies *non-tabular* files, adds basic tag for spatial data."""
-        df: pl.DataFrame = pl.read_json(source)
-        if any(tp.is_nested() for tp in df.schema.dtypes()):
-            if df.columns[0] == "type":
-                tp = TopoResource if df.item(0, 0) == "Topology" else GeoResource
-            else:
+        """
+        Identifies *non-tabular* files, adds basic tag for spatial data.
+
+        When ``source`` is too large to read in full, its first rows are sniffed instead.
+        If those are not records, the file is described as a ``JsonResource``.
+        """
+        tp = cls.sniff_json(source)
+        if tp is None and cls.is_large(source):
+            tp = cls.sniff_json_rows(source)
+            if tp is None:
+                msg = (
+                    f"Could not identify the structure of {source.name!r} "
+                    f"from its first {JSON_INFER_ROWS} rows, describing as 'json'"
+                )
+                logger.warning(msg)
                 tp = JsonResource
-        else:
-            tp = TableResource
+        tp = tp or cls.read_json_type(source)
         return cls.infer_as(source, tp)
 
+    @classmethod
+    def sniff_json(
+        cls, source: Path, /, n_bytes: int = JSON_SNIFF_BYTES
+    ) -> ResourceConstructor | None:
+        """
+        Identify the resource type from a bounded prefix of ``source``.
+
+        Top-level members are decoded one at a time, stopping at the first that
+        is truncated by the end of the prefix.
+
+        Returns
+        -------
+        The same constructor as ``read_json_type``, or ``None`` when the prefix is ambiguous.
+        """
+        with source.open("rb") as f:
+            prefix = f.read(n_bytes)
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        text = decoder.decode(prefix, final=len(prefix) < n_bytes)
+        idx = _skip_whitespace(text, 0)
+        match text[idx : idx + 1]:
+            case "{":
+                members, complete = _decode_json_members(text, idx + 1, keyed=True)
+                if members and members[0][0] == "type":
+                    match members[0][1]:
+                        case "Topology":
+                            return TopoResource
+                        case "FeatureCollection" | "Feature":
+                            return GeoResource
+                        case _:
+                            return None
+                if any(_is_nested(value) for _, value in members):
+                    return JsonResource
+                return TableResource if complete else None
+            case "[":
+                items, complete = _decode_json_members(text, idx + 1, keyed=False)
+                return _json_rows_type(items[:JSON_INFER_ROWS], complete=complete)
+            case _:
+                return None
+
+    @classmethod
+    def sniff_json_rows(cls, source: Path, /) -> ResourceConstructor | None:
+        """
+        Identify an array of records from its first ``JSON_INFER_ROWS`` members.
+
+        Unlike ``sniff_json``, each member is read in full however long it is,
+        holding only those members in memory (see ``iter_json_array``).
+        """
+        rows = iter_json_array(source)
+        try:
+            head = list(itertools.islice(rows, JSON_INFER_ROWS))
+        except (TypeError, ValueError):
+            return None
+        finally:
+            rows.close()
+        return _json_rows_type(head, complete=len(head) < JSON_INFER_ROWS)
+
+    @classmethod
+    def read_json_type(cls, source: Path, /) -> ResourceConstructor:
+        """Identify the resource type from the schema of the entire file."""
+        df: pl.DataFrame = pl.read_json(source, infer_schema_length=JSON_INFER_ROWS)
+        if any(tp.is_nested() for tp in df.schema.dtypes()):
+            if df.columns[0] == "type":
+                return TopoResource if df.item(0, 0) == "Topology" else GeoResource
+            return JsonResource
+        return TableResource
+
     @classmethod
     def _extract_file_parts(cls, source: Path, /) -> PathMeta:
         """Metadata that can be inferred from the file path *alone*."""
@@ -355,11 +631,79 @@ class ResourceAdapter:
     def with_extras(resource: Resource, /, **extras: Unpack[ResourceMeta]) -> Resource:
         """Supplement inferred metadata with manually defined ``extras``."""
         if "schema" in extras:
-            resource.schema = merge_schemas(resource, extra=extras.pop("schema"))
+            with PROFILER.measure(resource.name, "merge_schemas"):
+                resource.schema = merge_schemas(resource, extra=extras.pop("schema"))
         for name, value in extras.items():
             setattr(resource, name, value)
         return resource
 
+    @classmethod
+    def with_stats(cls, resource: Resource, source: Path, /) -> Resource:
+        """
+        Supplement a tabular resource with statistics, collected in a single pass.
+
+        Uses the `Data Package`_ extension mechanism, adding:
+        - ``rows`` to the resource
+        - ``stats`` (see ``FieldStats``) to each field
+
+        Files that are too large to read in full are streamed in batches, which
+        omits ``approxDistinctCount``.
+
+        .. _Data Package:
+            https://datapackage.org/recipes/data-package-extensions/
+        """
+        if resource.type != "table" or not resource.schema:
+            return resource
+        fields = resource.schema.fields
+        if cls.is_large(source):
+            rows, stats = stream_stats(source, fields, cls.batch_bytes())
+        else:
+            rows, stats = frame_stats(scan_fields(source, fields), fields)
+        resource.custom["rows"] = rows
+        for field in resource.schema.fields:
+            if field_stats := stats.get(field.name):
+                field.custom["stats"] = field_stats
+        return resource
+
+    @classmethod
+    def with_dtypes(cls, resource: Resource, source: Path, /) -> Resource:
+        """
+        Supplement the fields of a tabular resource with a physical ``dtype``.
+
+        Lets a loader materialize compact columns directly, see ``NarrowestDtypes``.
+        """
+        if resource.type != "table" or not resource.schema:
+            return resource
+        fields = resource.schema.fields
+        dtypes = NarrowestDtypes(fields)
+        if cls.is_large(source):
+            batches = iter_frame_batches(source, cls.batch_bytes(), fields)
+        else:
+            batches = iter((scan_fields(source, fields).collect(),))
+        for batch in batches:
+            dtypes.update(batch)
+        for field in resource.schema.fields:
+            if dtype := dtypes.get(field.name):
+                field.custom["dtype"] = dtype
+        return resource
+
+    @classmethod
+    def with_preview(cls, resource: Resource, source: Path, /) -> Resource:
+        """
+        Supplement a tabular resource with a ``Preview`` of its rows.
+
+        Files that are too large to read in full are streamed in batches, twice.
+        """
+        if resource.type != "table" or not resource.schema:
+            return resource
+        fields, n = resource.schema.fields, cls.preview_rows
+        if cls.is_large(source):
+            preview = stream_preview(source, fields, cls.batch_bytes(), n)
+        else:
+            preview = frame_preview(scan_fields(source, fields), n)
+        resource.custom["preview"] = preview
+        return resource
+
 
 def merge_schemas(resource: Resource, *, extra: Schema) -> fl.Schema:
     if schema := resource.schema:
@@ -379,6 +723,73 @@ def _flatten_schema(schema: Schema, /) -> dict[str, Field]:
     return {field["name"]: field for field in schema["fields"]}
 
 
+def _is_nested(obj: Any, /) -> bool:
+    return isinstance(obj, dict | list)
+
+
+def _json_rows_type(
+    rows: Sequence[Any], /, *, complete: bool
+) -> ResourceConstructor | None:
+    """
+    Identify the resource type from the first rows of a top-level array.
+
+    ``complete`` is whether ``rows`` holds every member of the array.
+    """
+    if not rows or not all(isinstance(row, dict) and row for row in rows):
+        return None
+    if any(_is_nested(v) for row in rows for v in row.values()):
+        return JsonResource if next(iter(rows[0])) != "type" else None
+    if complete or len(rows) == JSON_INFER_ROWS:
+        return TableResource
+    return None
+
+
+def _skip_whitespace(text: str, idx: int, /) -> int:
+    return _JSON_WHITESPACE.match(text, idx).end()  # type: ignore[union-attr]
+
+
+def _decode_json_members(
+    text: str, idx: int, /, *, keyed: bool
+) -> tuple[list[Any], bool]:
+    """
+    Decode the members of a (possibly truncated) array or object, starting after the opening bracket.
+
+    Returns
+    -------
+    Each decoded member, as ``(key, value)`` pairs when ``keyed``.
+    Followed by whether the closing bracket was reached.
+    """
+    decoder = _JSON_DECODER
+    closing = "}" if keyed else "]"
+    members: list[Any] = []
+    idx = _skip_whitespace(text, idx)
+    if text.startswith(closing, idx):
+        return members, True
+    while True:
+        try:
+            if keyed:
+                key, idx = decoder.raw_decode(text, idx)
+                idx = _skip_whitespace(text, idx)
+                if not text.startswith(":", idx):
+                    return members, False
+                value, idx = decoder.raw_decode(text, _skip_whitespace(text, idx + 1))
+                members.append((key, value))
+            else:
+                value, idx = decoder.raw_decode(text, idx)
+                members.append(value)
+        except json.JSONDecodeError:
+            return members, False
+        idx = _skip_whitespace(text, idx)
+        if text.startswith(",", idx):
+            idx = _skip_whitespace(text, idx + 1)
+        else:
+            return members, text.startswith(closing, idx)
+
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
 class PathMeta(TypedDict):
     name: str
     path: str
@@ -418,6 +829,38 @@ class Field(TypedDict, total=False):
     description: str
 
 
+class FieldStats(TypedDict, total=False):
+    """
+    Summary of the values of a single field.
+
+    ``min`` and ``max`` are only included for fields in ``STATS_RANGE_TYPES``.
+    """
+
+    nullCount: Required[int]
+    approxDistinctCount: int
+    """
+    Estimated using `HyperLogLog`_.
+
+    .. _HyperLogLog:
+        https://docs.pola.rs/api/python/stable/reference/expressions/api/polars.Expr.approx_n_unique.html
+    """
+    min: Any
+    max: Any
+
+
+class Preview(TypedDict):
+    """
+    A deterministic sample of the rows of a tabular resource.
+
+    Lets a consumer render a dataset from the descriptor alone, without downloading it.
+    """
+
+    head: Sequence[Mapping[str, Any]]
+    """The first rows."""
+    sample: Sequence[Mapping[str, Any]]
+    """Rows drawn at random from the remainder, seeded by ``PREVIEW_SEED``, in file order."""
+
+
 class Schema(TypedDict):
     """https://datapackage.org/standard/table-schema/#properties."""
 
@@ -456,6 +899,548 @@ def frame_to_schema(frame: pl.LazyFrame | pl.DataFrame, /) -> fl.Schema:
     )
 
 
+def frame_stats(
+    frame: pl.LazyFrame, fields: Sequence[fl.Field], /, *, distinct: bool = True
+) -> tuple[int, dict[str, FieldStats]]:
+    """
+    Compute the number of rows and ``FieldStats`` for each of ``fields``, in one query.
+
+    Fields that are not columns of ``frame`` are skipped.
+    Pass ``distinct=False`` to skip ``approxDistinctCount``.
+    """
+    schema = frame.collect_schema()
+    exprs: list[pl.Expr] = [pl.len().alias("rows")]
+    for field in fields:
+        if (dtype := schema.get(field.name)) is None:
+            continue
+        column = pl.col(field.name)
+        field_exprs = [column.null_count().alias("nullCount")]
+        if distinct and not dtype.is_nested():
+            n_unique = column.to_physical().approx_n_unique()
+            field_exprs.append(n_unique.alias("approxDistinctCount"))
+        # NOTE: Temporal values in `.json`, or with a `format`, are read as strings
+        is_temporal_text = field.type in TEMPORAL_TYPES and dtype == pl.String
+        if is_temporal_text:
+            column = parse_temporal(column, field)
+        if field.type in STATS_RANGE_TYPES and (
+            dtype.is_numeric()
+            or dtype.is_temporal()
+            or dtype == pl.Boolean
+            or is_temporal_text
+        ):
+            field_exprs.extend((column.min().alias("min"), column.max().alias("max")))
+        exprs.append(pl.struct(field_exprs).alias(field.name))
+    row = frame.select(exprs).collect().row(0, named=True)
+    rows = row.pop("rows")
+    stats = {
+        name: cast("FieldStats", {k: _to_json_value(v) for k, v in values.items()})
+        for name, values in row.items()
+    }
+    return rows, stats
+
+
+def parse_temporal(column: pl.Expr, field: fl.Field, /) -> pl.Expr:
+    """
+    Parse the strings of a ``date``, ``datetime`` or ``time`` field, using its ``format``.
+
+    Values that don't match the format are null, see ``TEMPORAL_TYPES``.
+    """
+    fmt = None if field.format in {None, "default", "any"} else field.format
+    match field.type:
+        case "date":
+            return column.str.to_date(fmt, strict=False)
+        case "datetime":
+            return column.str.to_datetime(fmt, strict=False)
+        case "time":
+            return column.str.to_time(fmt, strict=False)
+        case _:
+            return column
+
+
+def frame_preview(frame: pl.LazyFrame, n: int, /) -> Preview:
+    """Collect a ``Preview`` of ``n`` rows per part, in one query."""
+    is_sampled = pl.int_range(pl.len()).shuffle(seed=PREVIEW_SEED) < n
+    head, sample = pl.collect_all([frame.head(n), frame.slice(n).filter(is_sampled)])
+    return Preview(head=_to_json_rows(head), sample=_to_json_rows(sample))
+
+
+def _to_json_rows(frame: pl.DataFrame, /) -> list[dict[str, Any]]:
+    return [
+        {k: _to_json_value(v) for k, v in row.items()}
+        for row in frame.iter_rows(named=True)
+    ]
+
+
+def stream_stats(
+    source: Path, fields: Sequence[fl.Field], batch_bytes: int, /
+) -> tuple[int, dict[str, FieldStats]]:
+    """
+    Equivalent to ``frame_stats``, reading ``source`` in batches of roughly ``batch_bytes``.
+
+    ``approxDistinctCount`` cannot be combined across batches, so is omitted.
+    """
+    total = 0
+    merged: dict[str, FieldStats] = {}
+    for batch in iter_frame_batches(source, batch_bytes, fields):
+        rows, stats = frame_stats(batch.lazy(), fields, distinct=False)
+        total += rows
+        for name, field_stats in stats.items():
+            merged[name] = (
+                _merge_stats(merged[name], field_stats)
+                if name in merged
+                else field_stats
+            )
+    return total, merged
+
+
+def stream_preview(
+    source: Path, fields: Sequence[fl.Field], batch_bytes: int, n: int, /
+) -> Preview:
+    """
+    Equivalent to ``frame_preview``, reading ``source`` in batches of roughly ``batch_bytes``.
+
+    The first pass counts rows and unifies the dtypes of each batch, the second
+    collects the rows that ``frame_preview`` would draw.
+    """
+    heights: list[int] = []
+    empty: list[pl.DataFrame] = []
+    for batch in iter_frame_batches(source, batch_bytes, fields):
+        heights.append(batch.height)
+        empty.append(batch.clear())
+    if not empty:
+        return Preview(head=[], sample=[])
+    is_sampled = pl.int_range(max(sum(heights) - n, 0)).shuffle(seed=PREVIEW_SEED) < n
+    drawn = pl.select(is_sampled).to_series().arg_true() + n
+    head = [pl.concat(empty, how="diagonal_relaxed")]
+    sample = head.copy()
+    offset = 0
+    for batch in iter_frame_batches(source, batch_bytes, fields):
+        end = offset + batch.height
+        head.append(batch.head(max(n - offset, 0)))
+        sample.append(batch[drawn.filter(drawn.is_between(offset, end - 1)) - offset])
+        offset = end
+    return Preview(
+        head=_to_json_rows(pl.concat(head, how="diagonal_relaxed")),
+        sample=_to_json_rows(pl.concat(sample, how="diagonal_relaxed")),
+    )
+
+
+def _merge_stats(left: FieldStats, right: FieldStats, /) -> FieldStats:
+    merged = FieldStats(nullCount=left["nullCount"] + right["nullCount"])
+    for key, fn in (("min", min), ("max", max)):
+        values = [v for v in (left.get(key), right.get(key)) if v is not None]
+        if key in left or key in right:
+            merged[key] = fn(values) if values else None
+    return merged
+
+
+class NarrowestDtypes:
+    """
+    Narrowest ``polars`` dtype that holds every value of each field, accumulated per batch.
+
+    - ``integer`` and ``year`` fields use the smallest signed integer, like `shrink_dtype`_.
+    - ``number`` fields use ``Float32`` only when every value survives the round trip.
+      So do ``integer`` fields with any fractional value, see ``conform_dtypes``, where
+      integers from other batches must also be within ``FLOAT32_MAX_INTEGER``.
+    - ``string`` fields use ``Categorical`` when their values repeat enough, see
+      ``CATEGORICAL_MAX_DISTINCT`` and ``CATEGORICAL_MAX_RATIO``.
+
+    Other fields, and fields without any non-null values, have no ``dtype``.
+
+    .. _shrink_dtype:
+        https://docs.pola.rs/api/python/stable/reference/expressions/api/polars.Expr.shrink_dtype.html
+    """
+
+    def __init__(self, fields: Sequence[fl.Field], /) -> None:
+        self.types: dict[str, str] = {field.name: field.type for field in fields}
+        self.ranges: dict[str, tuple[int, int]] = {}
+        self.float32: dict[str, bool] = {}
+        self.counts: dict[str, int] = {}
+        self.distinct: dict[str, set[str] | None] = {}
+
+    def update(self, batch: pl.DataFrame, /) -> None:
+        for name, tp in self.types.items():
+            if name not in batch.columns:
+                continue
+            column = batch.get_column(name)
+            dtype = column.dtype
+            if tp in NUMERIC_DTYPES and dtype.is_integer():
+                self._update_range(name, column)
+            elif tp in NUMERIC_DTYPES and dtype.is_float():
+                self._update_float32(name, column)
+            elif tp == "string" and dtype in {pl.String, pl.Categorical}:
+                self._update_distinct(name, column.cast(pl.String))
+
+    def get(self, name: str, /) -> str | None:
+        if name in self.float32:
+            lo, hi = self.ranges.get(name, (0, 0))
+            fits = max(abs(lo), abs(hi)) <= FLOAT32_MAX_INTEGER
+            return str(pl.Float32 if self.float32[name] and fits else pl.Float64)
+        if rng := self.ranges.get(name):
+            lo, hi = rng
+            fits = (
+                n for n in INTEGER_BITS if -(2 ** (n - 1)) <= lo and hi < 2 ** (n - 1)
+            )
+            bits = next(fits, None)
+            return f"Int{bits}" if bits else None
+        if self.counts.get(name):
+            distinct = self.distinct[name]
+            is_categorical = (
+                distinct is not None
+                and len(distinct) <= self.counts[name] * CATEGORICAL_MAX_RATIO
+            )
+            return str(pl.Categorical if is_categorical else pl.String)
+        return None
+
+    def _update_range(self, name: str, column: pl.Series, /) -> None:
+        lo, hi = cast("int | None", column.min()), cast("int | None", column.max())
+        if lo is None or hi is None:
+            return
+        if name in self.ranges:
+            prev_lo, prev_hi = self.ranges[name]
+            lo, hi = min(lo, prev_lo), max(hi, prev_hi)
+        self.ranges[name] = lo, hi
+
+    def _update_float32(self, name: str, column: pl.Series, /) -> None:
+        values = column.drop_nulls().drop_nans()
+        fits = values.cast(pl.Float32).cast(values.dtype).equals(values)
+        self.float32[name] = self.float32.get(name, True) and fits
+
+    def _update_distinct(self, name: str, column: pl.Series, /) -> None:
+        values = column.drop_nulls()
+        self.counts[name] = self.counts.get(name, 0) + values.len()
+        distinct = self.distinct.get(name, set())
+        if distinct is not None:
+            distinct.update(values.unique().to_list())
+            if len(distinct) > CATEGORICAL_MAX_DISTINCT:
+                distinct = None
+        self.distinct[name] = distinct
+
+
+def iter_frame_batches(
+    source: Path, batch_bytes: int, fields: Sequence[fl.Field], /
+) -> Iterator[pl.DataFrame]:
+    """
+    Read a tabular file in batches, each using roughly ``batch_bytes`` of memory.
+
+    Like ``scan_fields``, the types of each batch are inferred from all of its rows and
+    then conformed to ``fields``. So one batch of an ``integer`` field may be ``Int64``
+    and another ``Float64``, but no value differs from a full read.
+    """
+    overrides = string_overrides(fields)
+    if source.suffix == ".json":
+        rows = iter_json_array(source)
+        head = list(itertools.islice(rows, JSON_INFER_ROWS))
+        if not head:
+            return
+        row_bytes = len(json.dumps(head).encode()) / len(head)
+        batches = itertools.batched(rows, max(1, int(batch_bytes // row_bytes)))
+        for batch in itertools.chain((head,), batches):
+            frame = pl.DataFrame(
+                batch, schema_overrides=overrides, infer_schema_length=None
+            )
+            yield conform_dtypes(_with_null_fields(frame, fields), fields)
+        return
+    scan = scan_tabular(source, n_bytes=batch_bytes)
+    head = scan.head(JSON_INFER_ROWS).collect()
+    if head.is_empty():
+        return
+    if source.suffix in {".csv", ".tsv"}:
+        # NOTE: `pl.read_csv_batched` memory-maps the entire file
+        separator = "\t" if source.suffix == ".tsv" else ","
+        temporal = {k: v for k, v in head.schema.items() if v.is_temporal()}
+        overrides = {k: v for k, v in overrides.items() if k in head.columns}
+        chunks = iter_csv_chunks(source, batch_bytes)
+        header = next(chunks, b"")
+        for body in chunks:
+            frame = pl.read_csv(
+                header + body,
+                separator=separator,
+                infer_schema_length=None,
+                schema_overrides=temporal | overrides,
+            )
+            yield conform_dtypes(frame, fields)
+        return
+    batch_rows = max(1, batch_bytes * head.height // max(head.estimated_size(), 1))
+    offset = 0
+    while not (batch := scan.slice(offset, batch_rows).collect()).is_empty():
+        yield conform_dtypes(batch, fields)
+        offset += batch.height
+
+
+def _with_null_fields(
+    frame: pl.DataFrame, fields: Sequence[fl.Field], /
+) -> pl.DataFrame:
+    """Add a column of nulls for each of ``fields`` that is a key of no row in ``frame``."""
+    if missing := [f.name for f in fields if f.name not in frame.columns]:
+        return frame.with_columns(pl.lit(None).alias(name) for name in missing)
+    return frame
+
+
+def iter_csv_chunks(source: Path, chunk_size: int, /) -> Iterator[bytes]:
+    """
+    Yield the header row of a delimited file, then blocks of roughly ``chunk_size`` bytes.
+
+    Blocks are split on line breaks outside of quoted values, so each holds
+    complete records that can be parsed alongside the header.
+    """
+    with source.open("rb") as f:
+        block, header = b"", None
+        while True:
+            chunk = f.read(chunk_size)
+            block += chunk
+            if header is None:
+                if not (end := _first_record_end(block)) and chunk:
+                    continue
+                header, block = block[: end or len(block)], block[end or len(block) :]
+                yield header
+            end = _last_record_end(block) if chunk else len(block)
+            if end:
+                yield block[:end]
+                block = block[end:]
+            if not chunk:
+                return
+
+
+def _first_record_end(block: bytes, /) -> int:
+    """Index after the first line break in ``block`` outside of a quoted value, or 0."""
+    idx = -1
+    while (idx := block.find(b"\n", idx + 1)) != -1:
+        if block.count(b'"', 0, idx) % 2 == 0:
+            return idx + 1
+    return 0
+
+
+def _last_record_end(block: bytes, /) -> int:
+    """Index after the last line break in ``block`` outside of a quoted value, or 0."""
+    quotes, idx = block.count(b'"'), len(block)
+    while (idx := block.rfind(b"\n", 0, idx)) != -1:
+        if (quotes - block.count(b'"', idx)) % 2 == 0:
+            return idx + 1
+    return 0
+
+
+def iter_json_array(
+    source: Path, /, chunk_size: int = JSON_SNIFF_BYTES
+) -> Iterator[Any]:
+    """
+    Yield each member of the top-level array in ``source``, reading ``chunk_size`` bytes at a time.
+
+    At most one chunk, and the member being decoded, are held in memory.
+    """
+    with source.open("rb") as f:
+        reader = _JsonChunkReader(f, chunk_size)
+        if not reader.next_token():
+            return
+        if reader.peek() != "[":
+            msg = f"Expected a JSON array in {source.name!r}, but got {reader.peek()!r}"
+            raise TypeError(msg)
+        reader.idx += 1
+        while reader.next_token():
+            if reader.peek() == "]":
+                return
+            if (obj := reader.decode()) is not _INCOMPLETE:
+                yield obj
+                if reader.peek() == ",":
+                    reader.idx += 1
+    msg = f"Unterminated JSON array in {source.name!r}"
+    raise TypeError(msg)
+
+
+_INCOMPLETE = object()
+
+
+class _JsonChunkReader:
+    """Decodes the members of a JSON array from a binary file, holding only undecoded text in memory."""
+
+    def __init__(self, f: IO[bytes], chunk_size: int, /) -> None:
+        self.f: IO[bytes] = f
+        self.chunk_size: int = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.text: str = ""
+        self.idx: int = 0
+        self.eof: bool = False
+
+    def fill(self) -> bool:
+        """Drop decoded text and read the next chunk, returning ``False`` at the end of the file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.eof = not chunk
+        decoded = self.decoder.decode(chunk, final=self.eof)
+        self.text, self.idx = self.text[self.idx :] + decoded, 0
+        return True
+
+    def next_token(self) -> bool:
+        """Skip whitespace, returning ``False`` if nothing remains."""
+        while (idx := _skip_whitespace(self.text, self.idx)) == len(self.text):
+            if not self.fill():
+                return False
+        self.idx = idx
+        return True
+
+    def peek(self) -> str:
+        return self.text[self.idx : self.idx + 1]
+
+    def decode(self) -> Any:
+        """Decode the value at ``idx``, or return ``_INCOMPLETE`` after reading more text."""
+        try:
+            obj, end = _JSON_DECODER.raw_decode(self.text, self.idx)
+        except json.JSONDecodeError:
+            if self.fill():
+                return _INCOMPLETE
+            raise
+        # NOTE: A value at the end of a chunk may be truncated (e.g. ``2.`` of ``2.5``)
+        end = _skip_whitespace(self.text, end)
+        if self.text[end : end + 1] not in {",", "]"} and self.fill():
+            return _INCOMPLETE
+        self.idx = end
+        return obj
+
+
+def _to_json_value(obj: Any, /) -> Any:
+    if isinstance(obj, dt.date | dt.time):
+        return obj.isoformat()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def scan_tabular(source: Path, /, n_bytes: int | None = None) -> pl.LazyFrame:
+    """
+    Lazily read a tabular file, inferring types from (up to) ``POLARS_INFER_ROWS``.
+
+    For delimited files, pass ``n_bytes`` to only read the lines within that prefix.
+    Otherwise, ``polars`` memory-maps the entire file, which counts toward RSS.
+    """
+    match source.suffix:
+        case ".csv" | ".tsv":
+            return _scan_csv_iso_dates(source, n_bytes=n_bytes)
+        case ".json":
+            # NOTE: A type inferred from the first rows could truncate any later values
+            return pl.read_json(source, infer_schema_length=None).lazy()
+        case ".parquet":
+            return pl.scan_parquet(source)
+        case ".arrow":
+            return pl.scan_ipc(source)
+        case _:
+            raise TypeError(source.suffix)
+
+
+def _scan_csv_iso_dates(
+    source: Path,
+    /,
+    n_bytes: int | None = None,
+    *,
+    full: bool = False,
+    schema_overrides: Mapping[str, pl.DataType] | None = None,
+) -> pl.LazyFrame:
+    """
+    Scan a delimited file, parsing temporal columns *only* when they use `ISO 8601`_.
+
+    ``polars`` also recognizes formats like ``"2015/01/01 01:00:00"``, which ``frictionless``
+    (and a ``datetime`` field without a ``format``) would treat as a string.
+
+    With ``n_bytes``, only the complete lines within that prefix of ``source`` are scanned.
+    Types are inferred from every row of smaller files, or of any file with ``full``.
+
+    .. _ISO 8601:
+        https://datapackage.org/standard/table-schema/#date
+    """
+    is_small = full or source.stat().st_size <= POLARS_INFER_FULL_BYTES
+    kwds: dict[str, Any] = {
+        "separator": "\t" if source.suffix == ".tsv" else ",",
+        "infer_schema_length": None if is_small else POLARS_INFER_ROWS,
+    }
+    data: Path | bytes = source
+    if n_bytes is not None:
+        with source.open("rb") as f:
+            prefix = f.read(n_bytes)
+        data = prefix[: prefix.rfind(b"\n") + 1] or prefix
+    overrides = dict(schema_overrides or {})
+    if overrides:
+        # NOTE: `polars` applies overrides by position when a name is not in the header
+        names = pl.scan_csv(data, infer_schema=False, **kwds).collect_schema().names()
+        overrides = {k: v for k, v in overrides.items() if k in names}
+    ldf = pl.scan_csv(data, try_parse_dates=True, schema_overrides=overrides, **kwds)
+    schema = ldf.collect_schema()
+    if temporal := [name for name, tp in schema.items() if tp.is_temporal()]:
+        raw = pl.scan_csv(data, infer_schema=False, **kwds).select(temporal)
+        is_iso = pl.all().drop_nulls().str.contains(r"^\d{4}-\d{2}-\d{2}").all()
+        checked = (
+            raw.head(POLARS_INFER_ROWS).select(is_iso).collect().row(0, named=True)
+        )
+        if not_iso := {name: pl.String() for name, ok in checked.items() if not ok}:
+            ldf = pl.scan_csv(
+                data,
+                try_parse_dates=True,
+                schema_overrides=overrides | not_iso,
+                **kwds,
+            )
+    return ldf
+
+
+def scan_fields(source: Path, fields: Sequence[fl.Field], /) -> pl.LazyFrame:
+    """
+    Lazily read a tabular file in full, with columns matching the types of ``fields``.
+
+    Unlike ``scan_tabular``, the types of ``.csv``, ``.tsv`` and ``.json`` columns are
+    inferred from *every* row, so a fractional value after the first rows is not truncated.
+    """
+    overrides = string_overrides(fields)
+    match source.suffix:
+        case ".csv" | ".tsv":
+            frame = _scan_csv_iso_dates(source, full=True, schema_overrides=overrides)
+        case ".json":
+            df = pl.read_json(source, infer_schema_length=None)
+            frame = df.cast({
+                k: v for k, v in overrides.items() if k in df.columns
+            }).lazy()
+        case _:
+            frame = scan_tabular(source)
+    return conform_dtypes(frame, fields)
+
+
+def string_overrides(fields: Sequence[fl.Field], /) -> dict[str, pl.DataType]:
+    """Read ``string`` fields as ``pl.String``, e.g. keeping the leading zeros of ``"01234"``."""
+    return {field.name: pl.String() for field in fields if field.type == "string"}
+
+
+def conform_dtypes[FrameT: (pl.DataFrame, pl.LazyFrame)](
+    frame: FrameT, fields: Sequence[fl.Field], /
+) -> FrameT:
+    """
+    Cast the columns of numeric ``fields`` to the dtype of their type, see ``NUMERIC_DTYPES``.
+
+    Inferred types can disagree with the data: ``integer`` fields holding a fractional
+    value keep a float dtype, rather than being truncated. Non-numeric columns, such as
+    ``.json`` strings, are left as they are.
+    """
+    schema = frame.collect_schema()
+    casts: dict[str, pl.DataType] = {}
+    for field in fields:
+        tp, dtype = NUMERIC_DTYPES.get(field.type), schema.get(field.name)
+        if tp is None or dtype is None or not (dtype.is_numeric() or dtype == pl.Null):
+            continue
+        target = pl.Float64() if dtype.is_float() else tp
+        if dtype != target:
+            casts[field.name] = target
+    return frame.cast(casts, strict=False) if casts else frame
+
+
+def diff_schemas(expected: fl.Schema | None, actual: fl.Schema, /) -> list[str]:
+    """Describe each field where ``actual`` disagrees with ``expected``."""
+    fields = {field.name: field.type for field in expected.fields} if expected else {}
+    diff: list[str] = []
+    for field in actual.fields:
+        if field.name not in fields:
+            diff.append(f"{field.name!r}: unexpected field")
+        elif (tp := fields.pop(field.name)) != field.type:
+            diff.append(f"{field.name!r}: {tp!r} != {field.type!r}")
+    diff.extend(f"{name!r}: missing field" for name in fields)
+    return diff
+
+
 def _extract_npm_metadata(m: Mapping[str, Any], /) -> PackageMeta:
     """
     Repurpose `package.json`_ for the `Data Package`_ standard.
@@ -565,7 +1550,15 @@ def iter_data_dir(data_root: Path, /) -> Iterator[Path]:
 
 
 def iter_resources(
-    root: Path, /, overrides: dict[str, ResourceMeta], gh_sha1: Mapping[str, str]
+    root: Path,
+    /,
+    overrides: dict[str, ResourceMeta],
+    digests: Mapping[str, FileDigests],
+    *,
+    sources: Iterable[Path] | None = None,
+    jobs: int = 1,
+    cache: InferenceCache | None = None,
+    extra_hashes: bool = False,
 ) -> Iterator[Resource]:
     """
     Yield all parseable resources, constructing with the most appropriate ``Resource`` class.
@@ -576,81 +1569,348 @@ def iter_resources(
         Directory storing datasets.
     overrides
         Additional metadata, with a higher precedence than inferred.
+    digests
+        Mapping from file name to ``FileDigests``.
+    sources
+        Subset of files in ``root`` to infer, defaults to every supported file.
+    jobs
+        Number of worker processes used for inference.
+        Resources are always yielded in the order of ``iter_data_dir``.
+    cache
+        Previously inferred resources, only files that miss are inferred.
+    extra_hashes
+        Record the ``sha256`` and ``md5`` digests in ``hashes``, alongside ``hash``.
     """
+    sources = list(iter_supported(root) if sources is None else sources)
+    keys: dict[Path, str] = {}
+    cached: dict[Path, dict[str, Any]] = {}
+    if cache is not None:
+        for fp in sources:
+            sha1 = digests[fp.name]["sha1"]
+            keys[fp] = cache_key(fp, sha1, overrides.get(fp.name))
+            if (descriptor := cache.get(fp.name, keys[fp])) is not None:
+                cached[fp] = descriptor
+        msg = f"Using {len(cached)} cached resources"
+        logger.info(msg)
+    missing = [fp for fp in sources if fp not in cached]
+    if jobs > 1 and len(missing) > 1:
+        resources = iter_infer_parallel(missing, overrides, jobs=jobs)
+    else:
+        resources = (infer_resource(fp, overrides.get(fp.name)) for fp in missing)
+    inferred = dict(zip(missing, resources, strict=True))
+    for fp in sources:
+        if fp in cached:
+            resource = Resource.from_descriptor(cached[fp])
+        else:
+            resource = inferred[fp]
+            if cache is not None:
+                cache.put(fp.name, keys[fp], resource.to_descriptor())
+        yield with_digests(resource, digests[fp.name], extra_hashes=extra_hashes)
+
+
+def with_digests(
+    resource: Resource, digest: FileDigests, /, *, extra_hashes: bool = False
+) -> Resource:
+    """Record ``digest`` in ``hash`` and, with ``extra_hashes``, in ``hashes``."""
+    resource.hash = f"sha1:{digest['sha1']}"
+    if extra_hashes:
+        resource.custom["hashes"] = [
+            f"sha256:{digest['sha256']}",
+            f"md5:{digest['md5']}",
+        ]
+    return resource
+
+
+def iter_supported(root: Path, /) -> Iterator[Path]:
+    """Yield files that ``ResourceAdapter`` can parse, warning on any others."""
     for fp in iter_data_dir(root):
-        if not ResourceAdapter.is_supported(fp):
+        if ResourceAdapter.is_supported(fp):
+            yield fp
+        else:
             msg = f"Skipping unexpected extension {fp.suffix!r}\n\n{fp!r}"
-            warnings.warn(msg, stacklevel=2)
-            continue
-        resource = ResourceAdapter.from_path(fp)
-        name = fp.name
-        if name in overrides:
-            resource = ResourceAdapter.with_extras(resource, **overrides[name])
-        resource.hash = gh_sha1[name]
-        yield resource
+            warnings.warn(msg, stacklevel=3)
 
 
-def run_check[T: (str, bytes)](
-    args: OneOrSeq[str | Path], /, into: type[T] = str
-) -> sp.CompletedProcess[T]:
+def select_sources(
+    root: Path, resources: Iterable[Mapping[str, Any]], patterns: Iterable[str], /
+) -> list[Path]:
     """
-    Run a command in a `subprocess`_, capturing its output.
+    Resolve the arguments of ``--only`` to files in ``root``.
+
+    Each pattern may be a resource ``name``, or the ``path`` of a resource or file,
+    optionally containing `shell-style wildcards`_.
+    Resources whose file was deleted are included, so that they can be dropped.
+    So are resources whose name changed, as another format of the same dataset
+    was added or removed.
+
+    .. _shell-style wildcards:
+        https://docs.python.org/3/library/fnmatch.html
+    """
+    paths = {r["name"]: r["path"] for r in resources}
+    names = set(paths.values()) | {
+        fp.name for fp in iter_data_dir(root) if ResourceAdapter.is_supported(fp)
+    }
+    selected: set[str] = set()
+    for pattern in patterns:
+        pat = Path(pattern).name
+        matches = {
+            path for name, path in paths.items() if fnmatch.fnmatchcase(name, pat)
+        }
+        matches.update(name for name in names if fnmatch.fnmatchcase(name, pat))
+        if not matches:
+            msg = (
+                f"{pattern!r} does not match the name or path of any resource in "
+                f"{root.as_posix()!r}"
+            )
+            raise TypeError(msg)
+        selected.update(matches)
+    bases = ResourceAdapter.multi_format_bases
+    selected.update(
+        path
+        for name, path in paths.items()
+        if name != make_uax31_name(Path(path), bases)
+    )
+    return [root / name for name in sorted(selected)]
+
+
+def splice_resources(
+    previous: Iterable[Mapping[str, Any]],
+    inferred: Iterable[Resource],
+    selected: Iterable[Path],
+    /,
+) -> list[Resource]:
+    """
+    Replace resources from an existing descriptor with those ``inferred``, matching on ``path``.
+
+    Any ``selected`` file that was not inferred (e.g. it has been deleted) is dropped.
+    """
+    replaced = {fp.name for fp in selected}
+    by_path = {
+        r["path"]: Resource.from_descriptor(dict(r))
+        for r in previous
+        if r["path"] not in replaced
+    }
+    by_path.update((r.path, r) for r in inferred)
+    return [by_path[path] for path in sorted(by_path)]
+
+
+def infer_resource(source: Path, extras: ResourceMeta | None = None, /) -> Resource:
+    """Infer a single resource, supplementing with ``extras`` when provided."""
+    with PROFILER.measure(source.name, "resource"):
+        resource = ResourceAdapter.from_path(source)
+        if extras:
+            resource = ResourceAdapter.with_extras(resource, **extras)
+        if ResourceAdapter.field_stats:
+            resource = ResourceAdapter.with_stats(resource, source)
+        if ResourceAdapter.dtype_hints:
+            resource = ResourceAdapter.with_dtypes(resource, source)
+        if ResourceAdapter.preview_rows:
+            resource = ResourceAdapter.with_preview(resource, source)
+    return resource
+
+
+def iter_infer_parallel(
+    sources: Sequence[Path], overrides: Mapping[str, ResourceMeta], /, *, jobs: int
+) -> Iterator[Resource]:
+    """
+    Infer ``sources`` in a `process pool`_, yielding resources in input order.
+
+    Workers return descriptors, which are reassembled into ``Resource``(s) here.
+    Serializing via ``Resource.to_descriptor`` keeps the output identical to the
+    sequential path, whereas pickling a ``Resource`` does not round-trip.
+
+    Notes
+    -----
+    Uses the *spawn* start method, as `polars`_ is not fork-safe.
+
+    .. _process pool:
+        https://docs.python.org/3/library/concurrent.futures.html#processpoolexecutor
+    .. _polars:
+        https://docs.pola.rs/user-guide/misc/multiprocessing/
+    """
+    extras = [overrides.get(fp.name) for fp in sources]
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=mp.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(Path.cwd(), ResourceAdapter.config(), PROFILER.enabled),
+    ) as pool:
+        for descriptor, measurements in pool.map(_infer_descriptor, sources, extras):
+            PROFILER.extend(measurements)
+            yield Resource.from_descriptor(descriptor)
+
+
+def _init_worker(cwd: Path, config: Mapping[str, Any], profile: bool, /) -> None:
+    """Restore the state ``main`` configures, which a spawned process does not inherit."""
+    os.chdir(cwd)
+    for name, value in config.items():
+        setattr(ResourceAdapter, name, value)
+    PROFILER.enabled = profile
+
+
+def _infer_descriptor(
+    source: Path, extras: ResourceMeta | None, /
+) -> tuple[dict[str, Any], list[Measurement]]:
+    descriptor = infer_resource(source, extras).to_descriptor()
+    return descriptor, PROFILER.drain()
+
+
+class InferenceCache:
+    """
+    Persistent store of inferred resources, keyed by everything that can change the result.
+
+    Each entry maps a file name to the descriptor produced by ``infer_resource``,
+    alongside the ``cache_key`` it was produced under.
+    Entries that were not accessed during a build are dropped on ``write``.
 
     Parameters
     ----------
-    args
-        Argument(s) that comprise the command.
-    into
-        Decode (``str``) stdout or keep encoded (``bytes``).
+    path
+        ``.json`` file to read from and write to.
+    """
+
+    def __init__(self, path: Path, /) -> None:
+        self.path: Path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._accessed: dict[str, dict[str, Any]] = {}
+
+    @classmethod
+    def from_path(cls, path: Path, /) -> InferenceCache:
+        obj = cls(path)
+        if path.exists():
+            obj._entries = read_json(path)
+        return obj
+
+    def get(self, name: str, key: str, /) -> dict[str, Any] | None:
+        entry = self._entries.get(name)
+        if entry and entry["key"] == key:
+            self._accessed[name] = entry
+            return copy.deepcopy(entry["resource"])
+        return None
+
+    def put(self, name: str, key: str, resource: dict[str, Any], /) -> None:
+        self._accessed[name] = {"key": key, "resource": resource}
+
+    def write(self, *, prune: bool = True) -> None:
+        """
+        Write entries to ``path``.
+
+        Parameters
+        ----------
+        prune
+            Drop entries that were not accessed, which is only correct after
+            a build that visited every file.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        accessed = self._accessed if prune else self._entries | self._accessed
+        entries = dict(sorted(accessed.items()))
+        self.path.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+        msg = f"Wrote {len(entries)} cached resources to {self.path.as_posix()!r}"
+        logger.info(msg)
+
 
-    .. _subprocess:
-        https://docs.python.org/3/library/subprocess.html#subprocess.run
+def cache_key(source: Path, sha1: str, extras: ResourceMeta | None, /) -> str:
     """
-    msg = str(args) if isinstance(args, str | Path) else " ".join(str(c) for c in args)
-    msg = f"Running command:\n    >>> {msg}"
-    logger.info(msg)
-    try:
-        return sp.run(args, check=True, capture_output=True, text=into is str)
-    except sp.CalledProcessError as err:
-        out = err.stderr
-        msg = f"{err.returncode}: {out.decode() if into is bytes else out}"
-        err.add_note(msg)
-        raise
+    Digest of the inputs to ``infer_resource``.
+
+    Covers the file contents, the derived resource name, overrides from
+    ``datapackage_additions.toml``, library versions and this script itself.
+    """
+    parts = (
+        source.name,
+        make_uax31_name(source, ResourceAdapter.multi_format_bases),
+        sha1,
+        extras,
+        ResourceAdapter.engine,
+        ResourceAdapter.field_stats,
+        ResourceAdapter.dtype_hints,
+        ResourceAdapter.preview_rows,
+        ResourceAdapter.memory_budget,
+        fl.__version__,
+        pl.__version__,
+        _builder_digest(),
+    )
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+@cache
+def _builder_digest() -> str:
+    """Any change to the inference code invalidates the cache."""
+    return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
 
 
-def extract_sha(source: str | Path, /) -> Mapping[str, str]:
+class FileDigests(TypedDict):
+    """Size and digests of a single file, computed by ``hash_file``."""
+
+    bytes: int
+    sha1: str
+    """
+    Digest of the `git blob`_ object for the bytes on disk.
+
+    Equivalent to ``git hash-object --no-filters``, which is what ``tests/`` verify.
+
+    .. _git blob:
+        https://git-scm.com/book/en/v2/Git-Internals-Git-Objects
     """
-    Get dataset hashes for the current branch via `ls-files`_.
+    sha256: str
+    md5: str
+
+
+def hash_file(source: Path, /, chunk_size: int = HASH_CHUNK_SIZE) -> FileDigests:
+    """
+    Compute all ``FileDigests`` in a single pass over ``source``.
+
+    Each chunk is read into the same buffer and fed to every digest while still in cache,
+    so memory use is bounded by ``chunk_size`` (unlike ``mmap``, whose pages count toward RSS).
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with source.open("rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        sha1 = hashlib.sha1(b"blob %d\0" % size)
+        sha256, md5 = hashlib.sha256(), hashlib.md5()
+        while n := f.readinto(buffer):
+            chunk = view[:n]
+            sha1.update(chunk)
+            sha256.update(chunk)
+            md5.update(chunk)
+    return FileDigests(
+        bytes=size,
+        sha1=sha1.hexdigest(),
+        sha256=sha256.hexdigest(),
+        md5=md5.hexdigest(),
+    )
+
+
+def extract_digests(
+    source: Path, /, max_workers: int | None = None
+) -> dict[str, FileDigests]:
+    """
+    Hash every file in ``source``, using a `thread pool`_.
+
+    ``hashlib`` releases the GIL while hashing large buffers, so files are hashed in parallel.
 
     Parameters
     ----------
     source
         Directory containing datasets.
+    max_workers
+        Maximum number of threads.
 
     Returns
     -------
-    Mapping from `Resource.path`_ to `Resource.hash`_.
+    Mapping from `Resource.path`_ to ``FileDigests``.
 
-    .. _ls-files:
-        https://git-scm.com/docs/git-ls-files
+    .. _thread pool:
+        https://docs.python.org/3/library/concurrent.futures.html#threadpoolexecutor
     .. _Resource.path:
         https://datapackage.org/standard/data-resource/#path-or-data
-    .. _Resource.hash:
-        https://datapackage.org/standard/data-resource/#hash
     """
-    COLUMNS = "path", "sha"
-    SHA = "sha1:%(objectname)"
-    PATH = "%(path)"
-    CMD_LS_FILES = ("git", "ls-tree", _current_branch(), f"--format={PATH},{SHA}")
-    with contextlib.chdir(Path(source)):
-        buf = io.BytesIO(run_check(CMD_LS_FILES, into=bytes).stdout)
-    return dict(pl.read_csv(buf, has_header=False, new_columns=COLUMNS).iter_rows())
-
-
-def _current_branch(*, ci_env_var: str = "GITHUB_SHA") -> str:
-    """Uses ``ci_env_var`` when run in a GitHub Action."""
-    CMD = "git", "branch", "--show-current"
-    return os.environ.get(ci_env_var) or run_check(CMD).stdout.rstrip()
+    paths = list(iter_data_dir(source))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return {
+            fp.name: d for fp, d in zip(paths, pool.map(hash_file, paths), strict=True)
+        }
 
 
 def read_toml(fp: Path, /) -> dict[str, Any]:
@@ -662,6 +1922,36 @@ def read_json(fp: Path, /) -> Any:
         return json.load(f)
 
 
+def additions_hash(fp: Path, /) -> str:
+    """Digest of ``datapackage_additions.toml``, in the same format as ``Resource.hash``."""
+    return f"sha1:{hash_file(fp)['sha1']}"
+
+
+def stamp_additions(pkg: Package, digest: str | None, /) -> None:
+    """
+    Record the ``additions_hash`` whose overrides every resource of ``pkg`` has applied.
+
+    With ``None``, nothing is recorded, and ``check_datapackage.py`` reports the package as stale.
+    """
+    if digest is not None:
+        pkg.custom[ADDITIONS_HASH] = digest
+
+
+def read_descriptor(fp: Path, /) -> dict[str, Any]:
+    """Read a descriptor previously written by ``write_package``."""
+    if fp.suffix == ".yaml":
+        import yaml  # noqa: PLC0415
+
+        return yaml.safe_load(fp.read_text("utf-8"))
+    return read_json(fp)
+
+
+def read_additions(fp: Path, /) -> tuple[dict[str, Any], dict[str, ResourceMeta]]:
+    """Split ``datapackage_additions.toml`` into package metadata and resource overrides."""
+    sources = read_toml(fp)
+    return sources, extract_overrides(sources.pop("resources"))
+
+
 def write_package(pkg: Package, repo_dir: Path, *formats: OutputFormat) -> None:
     """Write the final datapackage in one or more formats."""
     configs: dict[OutputFormat, tuple[str, PackageMethod[str]]] = {
@@ -674,66 +1964,702 @@ def write_package(pkg: Package, repo_dir: Path, *formats: OutputFormat) -> None:
         p = (repo_dir / f"{DATAPACKAGE}{postfix}").as_posix()
         msg = f"Writing {p!r}"
         logger.info(msg)
-        fn(pkg, p)
+        with PROFILER.measure(f"write_package[{fmt}]"):
+            fn(pkg, p)
+
 
+class ShardIndexEntry(TypedDict):
+    """Summary of a single resource, in the index written by ``write_shards``."""
+
+    path: str
+    bytes: int | None
+    hash: str | None
+    format: str | None
+    offset: int
+    """Position of the resource descriptor in ``datapackage.json``, in bytes."""
+    length: int
+    """Size of the resource descriptor in ``datapackage.json``, in bytes."""
 
-def write_string_overrides_ts(pkg: Package, repo_dir: Path) -> None:
-    """Generate src/stringOverrides.ts listing fields that should remain strings."""
-    string_fields_by_csv: dict[str, list[str]] = {}
+
+def write_shards(repo_dir: Path) -> None:
+    """
+    Split ``datapackage.json`` into one descriptor per resource, alongside a compact index.
+
+    Writes to a ``datapackage/`` directory::
+
+        datapackage/
+            index.json      # {"name", "version", "created", "resources": {name: ShardIndexEntry}}
+            {name}.json     # The descriptor of a single resource
+
+    Local tooling can load the metadata of a single dataset by reading just
+    ``index.json`` and one shard, or ``length`` bytes from ``offset`` of
+    ``datapackage.json``.
+
+    ``datapackage/`` is a local build artifact, ignored by git and not included in
+    the npm package. Published consumers read ``datapackage.json``.
+    """
+    src = repo_dir / f"{DATAPACKAGE}.json"
+    text = src.read_text("utf-8")
+    package = json.loads(text)
+    out_dir = repo_dir / DATAPACKAGE
+    out_dir.mkdir(exist_ok=True)
+    msg = f"Writing {len(package['resources'])} shards to {out_dir.as_posix()!r}"
+    logger.info(msg)
+    entries: dict[str, ShardIndexEntry] = {}
+    shards: set[Path] = set()
+    spans = _iter_resource_spans(text)
+    for resource, (offset, length) in zip(package["resources"], spans, strict=True):
+        name = resource["name"]
+        entries[name] = ShardIndexEntry(
+            path=resource["path"],
+            bytes=resource.get("bytes"),
+            hash=resource.get("hash"),
+            format=resource.get("format"),
+            offset=offset,
+            length=length,
+        )
+        shard = out_dir / f"{name}.json"
+        shard.write_text(_dumps_descriptor(resource), encoding="utf-8")
+        shards.add(shard)
+    index = {k: package[k] for k in ("name", "version", "created")}
+    index["resources"] = entries
+    (out_dir / "index.json").write_text(_dumps_descriptor(index), encoding="utf-8")
+    for stale in set(out_dir.glob("*.json")) - shards - {out_dir / "index.json"}:
+        stale.unlink()
+
+
+def _iter_resource_spans(text: str, /) -> Iterator[tuple[int, int]]:
+    """Yield the ``(offset, length)`` in bytes, of each member of ``"resources"`` in ``text``."""
+    idx = _skip_whitespace(text, _find_member(text, "resources") + 1)
+    char_pos, byte_pos = 0, 0
+    while text[idx] != "]":
+        _, end = _JSON_DECODER.raw_decode(text, idx)
+        byte_pos += len(text[char_pos:idx].encode())
+        length = len(text[idx:end].encode())
+        yield byte_pos, length
+        char_pos, byte_pos = end, byte_pos + length
+        idx = _skip_whitespace(text, end)
+        if text[idx] == ",":
+            idx = _skip_whitespace(text, idx + 1)
+
+
+def _find_member(text: str, key: str, /) -> int:
+    """
+    Index of the value of ``key`` in the top-level object of ``text``.
+
+    The values of earlier keys are decoded and skipped, as they may contain the
+    same key (in a nested object), or its text (in a string).
+    """
+    idx = _skip_whitespace(text, _skip_whitespace(text, 0) + 1)
+    while not text.startswith("}", idx):
+        name, idx = _JSON_DECODER.raw_decode(text, idx)
+        idx = _skip_whitespace(text, _skip_whitespace(text, idx) + 1)
+        if name == key:
+            return idx
+        _, idx = _JSON_DECODER.raw_decode(text, idx)
+        idx = _skip_whitespace(text, idx)
+        if text.startswith(",", idx):
+            idx = _skip_whitespace(text, idx + 1)
+    raise KeyError(key)
+
+
+def _dumps_descriptor(obj: Any, /) -> str:
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def write_column_types_ts(pkg: Package, repo_dir: Path) -> None:
+    """
+    Generate src/columnTypes.ts, mapping each field of a ``.csv`` to a ``ColumnType``.
+
+    Allows the loader in ``src/data.ts`` to apply one known conversion per column,
+    rather than guessing the type of every cell. ``"string"`` columns are left as-is.
+    Fields with a type outside of ``TS_COLUMN_TYPES`` are omitted.
+    """
+    column_types_by_path: dict[str, dict[str, dict[str, str]]] = {}
 
     for resource in pkg.resources:
         if resource.path.endswith(".csv") and resource.schema:
-            string_fields = [
-                f.name for f in resource.schema.fields if f.type == "string"
-            ]
-            if string_fields:
-                string_fields_by_csv[resource.path] = string_fields
-
-    ts_path = repo_dir / "src" / "stringOverrides.ts"
+            columns: dict[str, dict[str, str]] = {}
+            for f in resource.schema.fields:
+                if tp := TS_COLUMN_TYPES.get(f.type):
+                    column = {"type": tp}
+                    if f.format not in {None, "default", "any"}:
+                        column["format"] = f.format
+                    columns[f.name] = column
+            column_types_by_path[resource.path] = columns
+
+    ts_path = repo_dir / "src" / "columnTypes.ts"
     with ts_path.open("w", encoding="utf-8") as f:
         f.write(
-            f"export default {json.dumps(string_fields_by_csv, indent=2)} as Record<string, string[]>;\n"
+            'export type ColumnType = { type: "integer" | "number" | "boolean" | '
+            '"date" | "datetime" | "string"; format?: string };\n\n'
+            f"export default {json.dumps(column_types_by_path, indent=2)} "
+            "as Record<string, Record<string, ColumnType>>;\n"
         )
 
-    logger.info("Wrote string overrides to %s", ts_path)
+    logger.info("Wrote column types to %s", ts_path)
+
+
+class Measurement(TypedDict):
+    """Resource usage of a single block, recorded by ``Profiler.measure``."""
+
+    name: str
+    kind: MeasurementKind
+    wall: float
+    """Elapsed time, in seconds."""
+    cpu: float
+    """CPU time of the process (all threads), in seconds."""
+    peak_rss_growth: int | None
+    """
+    Bytes by which the high-water mark of the process resident set size grew during the block.
+
+    This is ``0`` when an earlier block had already set a higher mark, so is a lower
+    bound on the memory used by the block itself. Unavailable on Windows.
+    """
+    pid: int
+
+
+class Profiler:
+    """
+    Records ``Measurement``(s) for the phases of ``main``, and each resource.
+
+    Disabled by default, where ``measure`` does nothing.
+    """
+
+    def __init__(self, *, enabled: bool = False) -> None:
+        self.enabled: bool = enabled
+        self.measurements: list[Measurement] = []
+
+    @contextlib.contextmanager
+    def measure(self, name: str, kind: MeasurementKind = "phase") -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        wall, cpu, peak = time.perf_counter(), time.process_time(), _peak_rss()
+        try:
+            yield
+        finally:
+            after = _peak_rss()
+            growth = None if peak is None or after is None else after - peak
+            self.measurements.append(
+                Measurement(
+                    name=name,
+                    kind=kind,
+                    wall=time.perf_counter() - wall,
+                    cpu=time.process_time() - cpu,
+                    peak_rss_growth=growth,
+                    pid=os.getpid(),
+                )
+            )
+
+    def extend(self, measurements: Iterable[Measurement], /) -> None:
+        """Add measurements recorded in another process."""
+        self.measurements.extend(measurements)
+
+    def drain(self) -> list[Measurement]:
+        measurements, self.measurements = self.measurements, []
+        return measurements
+
+    def summary(self) -> str:
+        """
+        Table of measurements, sorted by wall time.
+
+        ``"merge_schemas"`` is shown as a single row, summing every resource.
+        """
+        rows = [m for m in self.measurements if m["kind"] != "merge_schemas"]
+        if merges := [m for m in self.measurements if m["kind"] == "merge_schemas"]:
+            growths = [g for m in merges if (g := m["peak_rss_growth"]) is not None]
+            rows.append(
+                Measurement(
+                    name=f"merge_schemas (x{len(merges)})",
+                    kind="phase",
+                    wall=sum(m["wall"] for m in merges),
+                    cpu=sum(m["cpu"] for m in merges),
+                    peak_rss_growth=max(growths, default=None),
+                    pid=merges[0]["pid"],
+                )
+            )
+        lines = [
+            f"{'kind':<9} {'name':<40} {'wall (s)':>9} {'cpu (s)':>9} {'+rss (MB)':>9}"
+        ]
+        for m in sorted(rows, key=itemgetter("wall"), reverse=True):
+            growth = m["peak_rss_growth"]
+            rss = "-" if growth is None else f"{growth / 1e6:.1f}"
+            lines.append(
+                f"{m['kind']:<9} {m['name']:<40} {m['wall']:>9.3f} {m['cpu']:>9.3f} {rss:>9}"
+            )
+        return "\n".join(lines)
+
+    def write(self, fp: Path, /) -> None:
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        fp.write_text(json.dumps(self.measurements, indent=2), encoding="utf-8")
+        msg = f"Wrote profile to {fp.as_posix()!r}\n{self.summary()}"
+        logger.info(msg)
+
+
+def _peak_rss() -> int | None:
+    if sys.platform == "win32":
+        return None
+    import resource  # noqa: PLC0415
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # NOTE: Reported in bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+PROFILER = Profiler()
+"""Shared by ``main`` and ``infer_resource``, enabled with ``--profile``."""
+
+
+type StatResult = tuple[int, int]
+"""``(st_mtime_ns, st_size)``, compared between scans by ``Watcher``."""
+
+
+class Watcher:
+    """
+    Rebuild the package each time ``data/`` or ``datapackage_additions.toml`` changes.
+
+    Resources from the initial build are kept in memory, so that a change only
+    re-infers the resources it touches:
+
+    - Files that were added, or whose contents changed.
+    - Files whose overrides in ``datapackage_additions.toml`` changed.
+    - Files whose name changed, as another format of the same dataset was added or removed.
+
+    Changes are detected by polling ``os.stat``, which needs no extra dependencies
+    and behaves the same on every platform.
+
+    Parameters
+    ----------
+    repo_dir
+        Root of the repository, as passed to ``main``.
+    npm_package
+        Contents of ``package.json``.
+    pkg
+        Result of the initial build.
+    digests
+        Digests used for the initial build.
+    cache
+        Updated with each re-inferred resource.
+    output_format
+        Format of the primary descriptor.
+    extra_hashes
+        Record the ``sha256`` and ``md5`` digests in ``hashes``, alongside ``hash``.
+    shards
+        Also split the descriptor with ``write_shards``.
+    """
+
+    def __init__(
+        self,
+        repo_dir: Path,
+        npm_package: Mapping[str, Any],
+        pkg: Package,
+        digests: Mapping[str, FileDigests],
+        /,
+        *,
+        cache: InferenceCache,
+        output_format: OutputFormat = "json",
+        extra_hashes: bool = False,
+        shards: bool = False,
+    ) -> None:
+        self.repo_dir: Path = repo_dir
+        self.data_dir: Path = repo_dir / "data"
+        self.sources_toml: Path = repo_dir / "_data" / ADDITIONS_TOML
+        self.npm_package: Mapping[str, Any] = npm_package
+        self.sources, self.overrides = read_additions(self.sources_toml)
+        self.resources: dict[str, Resource] = {r.path: r for r in pkg.resources}
+        self.digests: dict[str, FileDigests] = dict(digests)
+        self.cache: InferenceCache = cache
+        self.output_format: OutputFormat = output_format
+        self.extra_hashes: bool = extra_hashes
+        self.shards: bool = shards
+        self.additions_hash: str | None = pkg.custom.get(ADDITIONS_HASH)
+        self._additions_digest: str = additions_hash(self.sources_toml)
+        self.is_applied: bool = self.additions_hash == self._additions_digest
+        self.unapplied: set[str] = set()
+        self._data_stat: dict[str, StatResult] = self.stat_data_dir()
+        self._additions_stat: StatResult = _stat(self.sources_toml)
+
+    def run(self, interval: float = WATCH_INTERVAL) -> None:
+        """Poll for changes every ``interval`` seconds, until interrupted."""
+        msg = f"Watching {self.data_dir.as_posix()!r} for changes (Ctrl+C to stop) ..."
+        logger.info(msg)
+        with contextlib.suppress(KeyboardInterrupt):
+            while True:
+                time.sleep(interval)
+                if (touched := self.scan()) is not None:
+                    self.rebuild(touched)
+
+    def stat_data_dir(self) -> dict[str, StatResult]:
+        return {fp.name: _stat(fp) for fp in iter_data_dir(self.data_dir)}
+
+    def scan(self) -> set[str] | None:
+        """
+        Return the names of files in ``data/`` with a resource that needs re-inferring.
+
+        An empty set means that only package-level metadata changed, and ``None``
+        that there is nothing to rebuild.
+        """
+        data_stat = self.stat_data_dir()
+        additions_stat = _stat(self.sources_toml)
+        changed = {
+            name for name, st in data_stat.items() if self._data_stat.get(name) != st
+        }
+        added = data_stat.keys() - self._data_stat.keys()
+        removed = self._data_stat.keys() - data_stat.keys()
+        touched = self.update_digests(changed, removed)
+        overridden = None
+        if additions_stat != self._additions_stat:
+            overridden = self.update_additions()
+            touched.update(overridden or ())
+        if added or removed:
+            touched.update(self.update_names())
+        self._data_stat, self._additions_stat = data_stat, additions_stat
+        return touched if touched or overridden is not None else None
+
+    def update_digests(self, changed: set[str], removed: set[str], /) -> set[str]:
+        """Rehash ``changed`` files, skipping any where only the modified time differs."""
+        touched = set(removed)
+        for name in removed:
+            self.digests.pop(name, None)
+        for name in changed:
+            digest = hash_file(self.data_dir / name)
+            previous = self.digests.get(name)
+            if previous is None or previous["sha1"] != digest["sha1"]:
+                self.digests[name] = digest
+                touched.add(name)
+        return touched
+
+    def update_additions(self) -> set[str] | None:
+        """
+        Reload ``datapackage_additions.toml``, returning files whose overrides changed.
+
+        Returns ``None`` if the contents are unchanged, or can't be parsed (e.g. when
+        saved half-written), in which case the previous overrides are kept.
+        """
+        digest = additions_hash(self.sources_toml)
+        if digest == self._additions_digest:
+            return None
+        try:
+            sources, overrides = read_additions(self.sources_toml)
+        except (tomllib.TOMLDecodeError, KeyError):
+            msg = f"Failed to read {self.sources_toml.name!r}, keeping the previous overrides"
+            logger.exception(msg)
+            return None
+        previous, self._additions_digest = self.overrides, digest
+        self.sources, self.overrides = sources, overrides
+        changed = {
+            name
+            for name in previous.keys() | self.overrides.keys()
+            if previous.get(name) != self.overrides.get(name)
+        }
+        self.unapplied.update(changed)
+        return changed
+
+    def update_names(self) -> set[str]:
+        """Return files whose ``Resource.name`` depends on the set of files in ``data/``."""
+        bases = identify_multi_format_datasets(self.data_dir)
+        ResourceAdapter.multi_format_bases = bases
+        return {
+            name
+            for name, resource in self.resources.items()
+            if resource.name != make_uax31_name(self.data_dir / name, bases)
+        }
+
+    def rebuild(self, touched: set[str], /) -> None:
+        """
+        Re-infer the ``touched`` resources and rewrite every output.
+
+        ``additionsHash`` is only updated while every override has been applied,
+        so a resource that failed to re-infer keeps the package stale.
+        """
+        for name in sorted(touched):
+            fp = self.data_dir / name
+            if name not in self.digests or not ResourceAdapter.is_supported(fp):
+                self.resources.pop(name, None)
+                self.unapplied.discard(name)
+                continue
+            msg = f"Re-inferring {name!r}"
+            logger.info(msg)
+            extras = self.overrides.get(name)
+            try:
+                resource = infer_resource(fp, extras)
+            except Exception:
+                msg = f"Failed to infer {name!r}, keeping the previous resource"
+                logger.exception(msg)
+                continue
+            digest = self.digests[name]
+            key = cache_key(fp, digest["sha1"], extras)
+            self.cache.put(name, key, resource.to_descriptor())
+            self.resources[name] = with_digests(
+                resource, digest, extra_hashes=self.extra_hashes
+            )
+            self.unapplied.discard(name)
+        if self.is_applied and not self.unapplied:
+            self.additions_hash = self._additions_digest
+        pkg_meta = extract_package_metadata(self.npm_package, self.sources)
+        resources = [self.resources[name] for name in sorted(self.resources)]
+        pkg = Package(resources=resources, **pkg_meta)  # type: ignore[arg-type]
+        stamp_additions(pkg, self.additions_hash)
+        self.cache.write()
+        write_package(pkg, self.repo_dir, self.output_format, "md")
+        if self.shards:
+            write_shards(self.repo_dir)
+        write_column_types_ts(pkg, self.repo_dir)
+
+
+def _stat(fp: Path, /) -> StatResult:
+    st = fp.stat()
+    return st.st_mtime_ns, st.st_size
 
 
 def main(
     *,
     output_format: Literal["json", "yaml"] = "json",
+    jobs: int = 1,
+    use_cache: bool = True,
+    engine: InferenceEngine = "frictionless",
+    schema_diff: bool = False,
+    field_stats: bool = False,
+    dtype_hints: bool = False,
+    preview_rows: int = 0,
+    memory_budget: int | None = None,
+    extra_hashes: bool = False,
+    shards: bool = False,
+    profile: Path | None = None,
+    watch: bool = False,
+    only: Sequence[str] = (),
+    repo_dir: Path | None = None,
 ) -> None:
     if output_format not in {"json", "yaml"}:
         msg = f"Expected one of {['json', 'yaml']!r} but got {output_format!r}"
         raise TypeError(msg)
-    repo_dir: Path = Path(__file__).parent.parent
+    if shards and output_format != "json":
+        msg = (
+            f"`shards` requires an `output_format` of 'json', but got {output_format!r}"
+        )
+        raise TypeError(msg)
+    if jobs < 1:
+        msg = f"Expected `jobs` to be a positive integer, but got {jobs!r}"
+        raise TypeError(msg)
+    if engine not in {"frictionless", "polars"}:
+        msg = f"Expected one of {['frictionless', 'polars']!r} but got {engine!r}"
+        raise TypeError(msg)
+    # NOTE: Overridable to build a package from a different tree (e.g. in benchmarks)
+    repo_dir = repo_dir or Path(__file__).parent.parent
     data_dir: Path = repo_dir / "data"
     sources_toml: Path = repo_dir / "_data" / ADDITIONS_TOML
     npm_json = repo_dir / NPM_PACKAGE
+    cache_json = repo_dir / "_data" / CACHE_DIR / "resources.json"
 
     npm_package = read_json(npm_json)
-    sources = read_toml(sources_toml)
-    overrides = extract_overrides(sources.pop("resources"))
+    sources, overrides = read_additions(sources_toml)
     # NOTE: Forcing base directory here
     # - Ensures ``frictionless`` doesn't insert platform-specific path separator(s)
     os.chdir(data_dir)
 
-    # Identify datasets with multiple formats
-    ResourceAdapter.multi_format_bases = identify_multi_format_datasets(data_dir)
+    PROFILER.enabled = profile is not None
+    with PROFILER.measure("main"):
+        # Identify datasets with multiple formats
+        ResourceAdapter.multi_format_bases = identify_multi_format_datasets(data_dir)
+        ResourceAdapter.engine = engine
+        ResourceAdapter.schema_diff = schema_diff
+        ResourceAdapter.field_stats = field_stats
+        ResourceAdapter.dtype_hints = dtype_hints
+        ResourceAdapter.preview_rows = preview_rows
+        ResourceAdapter.memory_budget = memory_budget
+
+        pkg_meta = extract_package_metadata(npm_package, sources)
+        previous: list[dict[str, Any]] = []
+        stamp: str | None = additions_hash(sources_toml)
+        requested: list[Path] = []
+        selected: list[Path] | None = None
+        with PROFILER.measure("extract_digests"):
+            if only:
+                descriptor = read_descriptor(
+                    repo_dir / f"{DATAPACKAGE}.{output_format}"
+                )
+                previous = descriptor["resources"]
+                # NOTE: Only the overrides of the selected resources are (re)applied
+                stamp = descriptor.get(ADDITIONS_HASH)
+                requested = select_sources(data_dir, previous, only)
+                selected = [fp for fp in requested if fp.exists()]
+                digests = {fp.name: hash_file(fp) for fp in selected}
+            else:
+                digests = extract_digests(data_dir)
+        cache = (
+            InferenceCache.from_path(cache_json)
+            if use_cache
+            else InferenceCache(cache_json)
+        )
+        msg = f"Collecting resources for '{pkg_meta['name']}@{pkg_meta['version']}' ..."
+        logger.info(msg)
+        resources = iter_resources(
+            data_dir,
+            overrides,
+            digests,
+            sources=selected,
+            jobs=jobs,
+            cache=cache,
+            extra_hashes=extra_hashes,
+        )
+        with PROFILER.measure("collect_resources"):
+            if only:
+                resources = splice_resources(previous, resources, requested)
+            pkg = Package(resources=list(resources), **pkg_meta)  # type: ignore[arg-type]
+            stamp_additions(pkg, stamp)
+        cache.write(prune=not only)
+        msg = f"Collected {len(pkg.resources)} resources"
+        logger.info(msg)
+        DEBUG_MARKDOWN = ("md",)
+        write_package(pkg, repo_dir, output_format, *DEBUG_MARKDOWN)
+        if shards:
+            with PROFILER.measure("write_shards"):
+                write_shards(repo_dir)
+        with PROFILER.measure("write_column_types_ts"):
+            write_column_types_ts(pkg, repo_dir)
+    if profile is not None:
+        PROFILER.write(profile)
+    if watch:
+        watcher = Watcher(
+            repo_dir,
+            npm_package,
+            pkg,
+            digests,
+            cache=cache,
+            output_format=output_format,
+            extra_hashes=extra_hashes,
+            shards=shards,
+        )
+        watcher.run()
+
 
-    pkg_meta = extract_package_metadata(npm_package, sources)
-    gh_sha1 = extract_sha(data_dir)
-    msg = f"Collecting resources for '{pkg_meta['name']}@{pkg_meta['version']}' ..."
-    logger.info(msg)
-    pkg = Package(
-        resources=list(iter_resources(data_dir, overrides, gh_sha1)),
-        **pkg_meta,  # type: ignore[arg-type]
+def _positive_int(s: str, /) -> int:
+    if not (s.isdigit() and int(s) >= 1):
+        msg = f"expected a positive integer, but got: {s!r}"
+        raise argparse.ArgumentTypeError(msg)
+    return int(s)
+
+
+def parse_args(argv: Sequence[str] | None = None, /) -> dict[str, Any]:
+    """Parse command line arguments into keyword arguments for ``main``."""
+    parser = argparse.ArgumentParser(
+        description="Generate `datapackage.json` from the contents of `/data/`."
     )
-    msg = f"Collected {len(pkg.resources)} resources"
-    logger.info(msg)
-    DEBUG_MARKDOWN = ("md",)
-    write_package(pkg, repo_dir, output_format, *DEBUG_MARKDOWN)
-    write_string_overrides_ts(pkg, repo_dir)
+    parser.add_argument(
+        "--output-format",
+        choices=("json", "yaml"),
+        default="json",
+        help="Format of the primary descriptor (default: %(default)s).",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Infer resources using N worker processes (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="use_cache",
+        help="Re-infer every resource, ignoring (and replacing) the cache.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("frictionless", "polars"),
+        default="frictionless",
+        help="Library used to infer tabular schemas (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--schema-diff",
+        action="store_true",
+        help="With `--engine polars`, log fields where frictionless infers a different type.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        dest="field_stats",
+        help="Add row counts to tabular resources and value statistics to their fields.",
+    )
+    parser.add_argument(
+        "--dtypes",
+        action="store_true",
+        dest="dtype_hints",
+        help=(
+            "Add the narrowest polars `dtype` that holds every value (e.g. `Int16`, "
+            "`Float32`, `Categorical`) to numeric and string fields."
+        ),
+    )
+    parser.add_argument(
+        "--preview",
+        nargs="?",
+        type=int,
+        default=0,
+        const=PREVIEW_ROWS,
+        dest="preview_rows",
+        metavar="N",
+        help=(
+            "Embed the first N rows of each tabular resource, and N more sampled at "
+            "random with a fixed seed, under `preview` (default N: %(const)s)."
+        ),
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=lambda s: int(s) * 1024 * 1024,
+        default=None,
+        metavar="MiB",
+        help=(
+            "Approximate memory available to infer each resource. Larger files are "
+            "streamed in batches, and their `--stats` omit `approxDistinctCount`."
+        ),
+    )
+    parser.add_argument(
+        "--extra-hashes",
+        action="store_true",
+        help="Also record sha256 and md5 digests of each file, under `hashes`.",
+    )
+    parser.add_argument(
+        "--shards",
+        action="store_true",
+        help=(
+            "Also write `datapackage/index.json`, with the path, bytes, hash, format and "
+            "offset of each resource, and `datapackage/{name}.json` per resource. "
+            "A local build artifact, which is not published."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=Path,
+        const=Path(__file__).parent.parent / "_data" / CACHE_DIR / "profile.json",
+        metavar="FILE",
+        help=(
+            "Record wall time, CPU time and peak RSS per phase and per resource, "
+            "writing a JSON report to FILE (default: _data/.cache/profile.json)."
+        ),
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        default=(),
+        metavar="NAME_OR_PATH",
+        help=(
+            "Re-infer only these resources, splicing them into the existing descriptor. "
+            "Accepts resource names, file names and wildcards, e.g. 'flights-*.json'."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "After building, keep running and rebuild whenever `data/` or "
+            f"`_data/{ADDITIONS_TOML}` changes, re-inferring only the affected resources."
+        ),
+    )
+    return vars(parser.parse_args(argv))
 
 
 if __name__ == "__main__":
-    main()
+    main(**parse_args())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+"""
+Checks that `datapackage.json`_ is up to date, using only the standard library.
+
+Compares the descriptor against ``data/`` and ``_data/datapackage_additions.toml``:
+
+- Every supported file in ``data/`` is described, and every resource has a file.
+- ``bytes`` and ``hash`` (git blob SHA-1) of each resource match the file on disk.
+- ``additionsHash`` matches ``_data/datapackage_additions.toml``.
+
+Without importing ``frictionless``, ``polars`` or ``jinja2``, a run takes
+milliseconds, so it can be used as a pre-commit check:
+
+    >>> python scripts/check_datapackage.py # doctest: +SKIP
+
+Exits with status 1 when ``scripts/build_datapackage.py`` needs to be run.
+
+.. _datapackage.json:
+    https://github.com/vega/vega-datasets/blob/main/datapackage.json
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).parent.parent
+DATA_DIR = REPO_ROOT / "data"
+DESCRIPTOR = REPO_ROOT / "datapackage.json"
+ADDITIONS_TOML = REPO_ROOT / "_data" / "datapackage_additions.toml"
+ADDITIONS_HASH = "additionsHash"
+"""Package property storing the digest of ``ADDITIONS_TOML``, set by ``build_datapackage.py``."""
+
+# NOTE: Keep in sync with `ResourceAdapter.is_supported` in `build_datapackage.py`
+SUPPORTED_SUFFIXES = frozenset({
+    ".csv",
+    ".tsv",
+    ".json",
+    ".parquet",
+    ".png",
+    ".jpg",
+    ".arrow",
+})
+CHUNK_SIZE = 1024 * 1024
+
+
+def git_blob_sha1(fp: Path, /) -> str:
+    """Equivalent to ``git hash-object --no-filters``."""
+    with fp.open("rb") as f:
+        digest = hashlib.sha1(b"blob %d\0" % os.fstat(f.fileno()).st_size)
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_problems(
+    descriptor: Mapping[str, Any], data_dir: Path, additions: Path, /
+) -> Iterator[str]:
+    """Yield a message for each way ``descriptor`` differs from the files it describes."""
+    expected_additions = f"sha1:{git_blob_sha1(additions)}"
+    if (recorded := descriptor.get(ADDITIONS_HASH)) != expected_additions:
+        yield f"{additions.name}: {ADDITIONS_HASH} is {recorded!r}, expected {expected_additions!r}"
+
+    resources = {r["path"]: r for r in descriptor["resources"]}
+    files = {
+        fp.name: fp
+        for fp in data_dir.iterdir()
+        if fp.is_file() and fp.suffix in SUPPORTED_SUFFIXES
+    }
+    for name in sorted(resources.keys() - files.keys()):
+        yield f"{name}: described, but missing from {data_dir.name}/"
+    for name in sorted(files.keys() - resources.keys()):
+        yield f"{name}: not described"
+
+    # NOTE: Only hash files whose size matches, any others are already stale
+    same_size: list[str] = []
+    for name in sorted(files.keys() & resources.keys()):
+        size, recorded = files[name].stat().st_size, resources[name].get("bytes")
+        if size == recorded:
+            same_size.append(name)
+        else:
+            yield f"{name}: bytes is {recorded!r}, expected {size!r}"
+    with ThreadPoolExecutor() as pool:
+        digests = pool.map(git_blob_sha1, (files[name] for name in same_size))
+        for name, digest in zip(same_size, digests, strict=True):
+            if (recorded := resources[name].get("hash")) != f"sha1:{digest}":
+                yield f"{name}: hash is {recorded!r}, expected 'sha1:{digest}'"
+
+
+def main() -> int:
+    descriptor = json.loads(DESCRIPTOR.read_text(encoding="utf-8"))
+    problems = list(iter_problems(descriptor, DATA_DIR, ADDITIONS_TOML))
+    if not problems:
+        logger.info("%s is up to date", DESCRIPTOR.name)
+        return 0
+    for problem in problems:
+        logger.error(problem)
+    msg = f"{DESCRIPTOR.name} is stale, run `uv run scripts/build_datapackage.py` to update it"
+    logger.error(msg)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,17 +23,25 @@ See Also
 from __future__ import annotations
 
 # ruff: noqa: PLC1901
+import argparse
 import asyncio
 import datetime as dt
-import io
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
 import tomllib
 import zipfile
 from collections import defaultdict, deque
 from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from functools import cached_property
 from pathlib import Path
-from typing import TYPE_CHECKING, Annotated, Literal
+from typing import TYPE_CHECKING, Annotated, Literal, TypedDict
 from typing import get_args as _typing_get_args
 
 import niquests
@@ -63,6 +71,21 @@ def is_extension(obj: Any) -> TypeIs[Extension]:
     return obj in _get_args(Extension)
 
 
+type Backend = Literal["thread", "process"]
+"""
+Where ``.zip`` -> ``.parquet`` conversions run.
+
+*thread*
+    A thread pool, sharing a single ``polars`` thread pool with everything else
+*process*
+    A process pool, each worker with its own ``polars`` thread pool
+"""
+
+
+def is_backend(obj: Any) -> TypeIs[Backend]:
+    return obj in _get_args(Backend)
+
+
 type WriteOptions = Mapping[str, Any]
 
 
@@ -131,6 +154,20 @@ type IntoDateRange = (
 )
 """Anything that can be converted into a ``DateRange``."""
 
+
+type Conversion = tuple[Path, asyncio.Future[Path]]
+"""A downloaded ``.zip``, and the future resolved with its ``.parquet``."""
+
+
+class ManifestEntry(TypedDict):
+    """Integrity record of a single monthly ``.parquet``, see ``SourceManifest``."""
+
+    bytes: int
+    mtime_ns: int
+    rows: int
+    sha256: str
+
+
 THOUSAND: Literal[1_000] = 1_000
 MILLION: Literal[1_000_000] = 1_000_000
 BILLION: Literal[1_000_000_000] = 1_000_000_000
@@ -247,6 +284,8 @@ REPORTING_PREFIX: LiteralString = (
     "On_Time_Reporting_Carrier_On_Time_Performance_1987_present_"
 )
 ZIP: Literal[".zip"] = ".zip"
+PART: Literal[".part"] = ".part"
+TMP: Literal[".tmp"] = ".tmp"
 PARQUET: Literal[".parquet"] = ".parquet"
 PATTERN_PARQUET: LiteralString = f"*{REPORTING_PREFIX}*{PARQUET}"
 
@@ -275,6 +314,20 @@ SCAN_SCHEMA: pl.Schema = pl.Schema({
     "Dest": pl.String,
     "Cancelled": pl.Float64,
 })
+CHUNK_SIZE: int = 1024 * 1024
+"""Bytes decompressed (or downloaded) at a time, when extracting (or requesting) a ``.zip``."""
+MAX_DOWNLOADS: int = 4
+"""Default limit on concurrent requests to `transtats`_."""
+MAX_CONVERSIONS: int = 2
+"""Default limit on concurrent ``.zip`` -> ``.parquet`` conversions (each is multi-threaded)."""
+RETRIES: int = 5
+"""Attempts made to request a ``.zip``, after the first has failed."""
+BACKOFF: float = 1.0
+"""Seconds to wait before the first retry, doubling for each that follows."""
+RETRY_STATUS: frozenset[int] = frozenset({408, 416, 429, 500, 502, 503, 504})
+"""Response status codes worth retrying, any other failure is raised immediately."""
+MANIFEST: LiteralString = "manifest.json"
+"""File in ``input_dir``, recording each monthly ``.parquet`` written by ``Flights``."""
 
 
 def _approx_latest(*, months_ago: int) -> dt.date:
@@ -752,6 +805,100 @@ class SourceMap:
         return len(self._frames)
 
 
+class SourceManifest:
+    """
+    Integrity record of monthly input files, persisted as ``MANIFEST``.
+
+    Each ``.parquet`` is recorded by its size, modification time, row count and
+    `SHA-256`_ digest once fully written. Files that are unrecorded or no longer
+    match (e.g. from an interrupted run) are not trusted.
+
+    Without a manifest, files already in ``input_dir`` (e.g. written before
+    manifests existed) are recorded if they are non-empty and readable.
+
+    Parameters
+    ----------
+    input_dir
+        Directory containing monthly input files.
+
+    .. _SHA-256:
+        https://docs.python.org/3/library/hashlib.html#hashlib.file_digest
+    """
+
+    def __init__(self, input_dir: Path, /) -> None:
+        self.path: Path = input_dir / MANIFEST
+        self._entries: dict[str, ManifestEntry] = {}
+        if self.path.exists():
+            self._entries = json.loads(self.path.read_text("utf-8"))
+        else:
+            self.adopt(input_dir.glob(PATTERN_PARQUET))
+
+    @staticmethod
+    def describe(fp: Path, /) -> ManifestEntry:
+        stat = fp.stat()
+        return {
+            "bytes": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "rows": _n_rows(fp),
+            "sha256": _sha256(fp),
+        }
+
+    def adopt(self, files: Iterable[Path], /) -> None:
+        """Record each of ``files`` that is a non-empty, readable ``.parquet``."""
+        for fp in files:
+            try:
+                entry = self.describe(fp) if fp.stat().st_size else None
+            except (OSError, pl.exceptions.PolarsError):
+                entry = None
+            if entry is None:
+                msg = f"Untrusted {fp.name!r}: not a readable parquet file"
+                logger.warning(msg)
+                continue
+            self._entries[fp.name] = entry
+        if self._entries:
+            self._write()
+
+    def record(self, fp: Path, entry: ManifestEntry, /) -> None:
+        """Add ``fp``, from its ``describe`` ``entry``, then (atomically) write the manifest."""
+        self._entries[fp.name] = entry
+        self._write()
+
+    def _write(self) -> None:
+        temp = self.path.with_name(f"{self.path.name}{TMP}")
+        temp.write_text(json.dumps(self._entries, indent=2, sort_keys=True), "utf-8")
+        temp.replace(self.path)
+
+    def verify(self, fp: Path, /, *, full: bool = False) -> bool:
+        """
+        Return True if ``fp`` is unchanged since it was recorded.
+
+        A matching size and modification time is trusted, unless ``full``.
+        Otherwise, the contents are hashed and counted. When they match, the
+        new modification time is recorded.
+        """
+        if (entry := self._entries.get(fp.name)) is None:
+            msg = f"Untrusted {fp.name!r}: not in {self.path.name!r}"
+            logger.warning(msg)
+            return False
+        stat = fp.stat()
+        # NOTE: Manifests written before `mtime_ns` was recorded are fully verified once
+        recorded = entry["bytes"], entry.get("mtime_ns")
+        if (stat.st_size, stat.st_mtime_ns) == recorded and not full:
+            return True
+        if (
+            stat.st_size != entry["bytes"]
+            or _sha256(fp) != entry["sha256"]
+            or _n_rows(fp) != entry["rows"]
+        ):
+            msg = f"Untrusted {fp.name!r}: changed since it was written"
+            logger.warning(msg)
+            return False
+        if stat.st_mtime_ns != entry.get("mtime_ns"):
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self._write()
+        return True
+
+
 class Flights:
     """
     Orchestrates flights dataset generation.
@@ -764,6 +911,18 @@ class Flights:
         Directory to store monthly input files.
     output_dir
         Directory to write realised specs to.
+    max_downloads
+        Maximum number of monthly sources requested at once.
+    max_conversions
+        Maximum number of downloaded monthly sources converted at once.
+    backend
+        Run conversions in a pool of threads or processes, see ``Backend``.
+    polars_threads
+        Size of the ``polars`` thread pool in each ``"process"`` worker.
+        Defaults to sharing all cores between ``max_conversions`` workers.
+    verify_sources
+        Hash every existing monthly input file, rather than trusting those whose
+        size and modification time match ``SourceManifest``.
 
     Notes
     -----
@@ -806,15 +965,47 @@ class Flights:
     output_dir: Path
     specs: Sequence[Spec]
     sources: SourceMap
+    max_downloads: int
+    max_conversions: int
+    backend: Backend
+    polars_threads: int
+    verify_sources: bool
 
     def __init__(
-        self, specs: Sequence[Spec], input_dir: str | Path, output_dir: str | Path
+        self,
+        specs: Sequence[Spec],
+        input_dir: str | Path,
+        output_dir: str | Path,
+        *,
+        max_downloads: int = MAX_DOWNLOADS,
+        max_conversions: int = MAX_CONVERSIONS,
+        backend: Backend = "thread",
+        polars_threads: int | None = None,
+        verify_sources: bool = False,
     ) -> None:
+        if polars_threads is None:
+            polars_threads = max((os.cpu_count() or 1) // max_conversions, 1)
+        for name, limit in (
+            ("max_downloads", max_downloads),
+            ("max_conversions", max_conversions),
+            ("polars_threads", polars_threads),
+        ):
+            if limit < 1:
+                msg = f"Expected `{name}` to be at least 1, but got: {limit!r}"
+                raise TypeError(msg)
+        if not is_backend(backend):
+            msg = f"Expected one of {_get_args(Backend)!r}, but got: {backend!r}"
+            raise TypeError(msg)
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.input_dir.mkdir(exist_ok=True)
         self.output_dir.mkdir(exist_ok=True)
         self.specs = specs
+        self.max_downloads = max_downloads
+        self.max_conversions = max_conversions
+        self.backend = backend
+        self.polars_threads = polars_threads
+        self.verify_sources = verify_sources
 
     @classmethod
     def from_toml(
@@ -823,6 +1014,12 @@ class Flights:
         /,
         input_dir: str | Path | None,
         output_dir: str | Path | None,
+        *,
+        max_downloads: int | None = None,
+        max_conversions: int | None = None,
+        backend: Backend | None = None,
+        polars_threads: int | None = None,
+        verify_sources: bool = False,
     ) -> Flights:
         """Construct from a toml file."""
         fp = Path(source)
@@ -834,6 +1031,13 @@ class Flights:
                 specs=[Spec.from_dict(spec) for spec in specs_array],
                 input_dir=input_dir or mapping["input_dir"],
                 output_dir=output_dir or mapping["output_dir"],
+                max_downloads=max_downloads
+                or mapping.get("max_downloads", MAX_DOWNLOADS),
+                max_conversions=max_conversions
+                or mapping.get("max_conversions", MAX_CONVERSIONS),
+                backend=backend or mapping.get("backend", "thread"),
+                polars_threads=polars_threads or mapping.get("polars_threads"),
+                verify_sources=verify_sources,
             )
         msg = (
             f"Expected to find an array of tables keyed to `'specs'`, but got\n"
@@ -864,8 +1068,13 @@ class Flights:
 
     @property
     def _existing_stems(self) -> set[str]:
+        manifest = SourceManifest(self.input_dir)
         it = self.input_dir.glob(PATTERN_PARQUET)
-        return {_without_suffixes(fp.name) for fp in it}
+        return {
+            _without_suffixes(fp.name)
+            for fp in it
+            if manifest.verify(fp, full=self.verify_sources)
+        }
 
     @property
     def missing_stems(self) -> set[str]:
@@ -880,12 +1089,115 @@ class Flights:
         return missing
 
     async def _download_sources_async(self, names: Iterable[str], /) -> list[Path]:
-        """Request, write missing data."""
-        session = niquests.AsyncSession(base_url=ROUTE_ZIP)
-        aws = (_request_async(session, name) for name in names)
-        buffers = await asyncio.gather(*aws)
-        writes = (_write_zip_to_parquet_async(self.input_dir, buf) for buf in buffers)
-        return await asyncio.gather(*writes)
+        """
+        Request, write missing data.
+
+        Downloads and conversions are overlapped, as a pipeline:
+
+        - A single pooled session is shared by every request, with at most
+          ``self.max_downloads`` in flight
+        - Each ``.zip`` is queued as soon as it arrives
+        - ``self.max_conversions`` workers convert them to ``.parquet``, in
+          a pool of ``self.backend``
+
+        Every month is attempted, even if others fail.
+        """
+        limit = asyncio.Semaphore(self.max_downloads)
+        queue: asyncio.Queue[Conversion] = asyncio.Queue()
+        manifest = SourceManifest(self.input_dir)
+        executor = self._conversion_executor()
+        workers = [
+            asyncio.create_task(self._convert_sources_async(queue, manifest, executor))
+            for _ in range(self.max_conversions)
+        ]
+        try:
+            async with niquests.AsyncSession(
+                base_url=ROUTE_ZIP, pool_maxsize=self.max_downloads
+            ) as session:
+                aws = (
+                    self._download_source_async(session, limit, queue, name)
+                    for name in sorted(names)
+                )
+                results = await asyncio.gather(*aws, return_exceptions=True)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            executor.shutdown(cancel_futures=True)
+        if errors := [r for r in results if isinstance(r, Exception)]:
+            msg = f"Failed to download {len(errors)} of {len(results)} sources"
+            raise ExceptionGroup(msg, errors)
+        return [r for r in results if isinstance(r, Path)]
+
+    async def _download_source_async(
+        self,
+        session: niquests.AsyncSession,
+        limit: asyncio.Semaphore,
+        queue: asyncio.Queue[Conversion],
+        name: str,
+        /,
+    ) -> Path:
+        """
+        Download a single ``.zip``, then wait for its conversion to ``.parquet``.
+
+        Failed requests are retried ``RETRIES`` times, with exponential backoff.
+        A ``.zip`` that was fully downloaded by an earlier run is reused.
+        """
+        zip_path = self.input_dir / f"{_without_suffixes(name)}{ZIP}"
+        for attempt in range(RETRIES + 1):
+            if zip_path.exists():
+                break
+            try:
+                async with limit:
+                    await _request_async(session, zip_path)
+            except niquests.RequestException as err:
+                if attempt == RETRIES or not _is_retryable(err):
+                    raise
+                delay = BACKOFF * 2**attempt
+                msg = f"Retrying {zip_path.name!r} in {delay}s, after: {err}"
+                logger.warning(msg)
+                await asyncio.sleep(delay)
+        converted = asyncio.get_running_loop().create_future()
+        await queue.put((zip_path, converted))
+        return await converted
+
+    def _conversion_executor(self) -> Executor:
+        if self.backend == "thread":
+            return ThreadPoolExecutor(self.max_conversions)
+        # NOTE: `"spawn"`, as forking a process that has already started `polars` threads is unsafe
+        return ProcessPoolExecutor(
+            self.max_conversions,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_conversion_worker,
+            initargs=(self.polars_threads,),
+        )
+
+    async def _convert_sources_async(
+        self,
+        queue: asyncio.Queue[Conversion],
+        manifest: SourceManifest,
+        executor: Executor,
+        /,
+    ) -> None:
+        """Worker converting each queued ``.zip`` to a recorded ``.parquet``, until cancelled."""
+        while True:
+            zip_path, converted = await queue.get()
+            try:
+                output = await _write_zip_to_parquet_async(
+                    self.input_dir, zip_path, executor
+                )
+                entry = await asyncio.get_running_loop().run_in_executor(
+                    executor, SourceManifest.describe, output
+                )
+                manifest.record(output, entry)
+                zip_path.unlink()
+            except Exception as err:  # noqa: BLE001
+                # NOTE: Most likely corrupt, so is requested again by the next run
+                zip_path.unlink(missing_ok=True)
+                converted.set_exception(err)
+            else:
+                converted.set_result(output)
+            finally:
+                queue.task_done()
 
     def download_sources(self) -> None:
         """
@@ -914,23 +1226,71 @@ class Flights:
         logger.info("Finished job.")
 
 
-async def _request_async(session: niquests.AsyncSession, name: str, /) -> io.BytesIO:
-    name = f"{_without_suffixes(name)}{ZIP}"
-    msg = f"Requesting {name!r} ..."
+async def _request_async(session: niquests.AsyncSession, output: Path, /) -> None:
+    """
+    Stream the response body to ``output``, in ``CHUNK_SIZE`` pieces.
+
+    Bytes are appended to a ``.part`` file, renamed to ``output`` once complete.
+    A ``.part`` left by an earlier attempt is resumed with an `HTTP Range`_ request.
+
+    .. _HTTP Range:
+        https://developer.mozilla.org/en-US/docs/Web/HTTP/Range_requests
+    """
+    name = output.name
+    partial = output.with_name(f"{name}{PART}")
+    offset = partial.stat().st_size if partial.exists() else 0
+    msg = (
+        f"Requesting {name!r} ..."
+        if not offset
+        else f"Resuming {name!r} at {offset:_} bytes ..."
+    )
     logger.info(msg)
-    async with session:
-        response = await session.get(name)
-        if response.ok and (content := response.content):
-            buf = io.BytesIO()
-            buf.write(content)
-            msg = f"Successful {name!r}"
-            logger.info(msg)
-            return buf
-        msg = f"Failed for {name!r}"
-        raise NotImplementedError(msg)
+    headers = {"Range": f"bytes={offset}-"} if offset else None
+    response = await session.get(name, headers=headers, stream=True)
+    consumed = False
+    try:
+        if response.status_code == 416:
+            partial.unlink(missing_ok=True)
+        # NOTE: A server ignoring `Range` responds with the full body
+        mode = "ab" if response.status_code == 206 else "wb"
+        with partial.open(mode) if response.ok else nullcontext() as f:
+            # NOTE: Error bodies are drained too, leaving the connection reusable
+            async for chunk in await response.iter_content(CHUNK_SIZE):
+                if f:
+                    f.write(chunk)
+        consumed = True
+    finally:
+        if consumed or response.raw is None:
+            await response.close()
+        else:
+            # NOTE: `AsyncResponse.close` doesn't await closing an unconsumed body
+            await response.raw.close()
+            response.raw.release_conn()
+    response.raise_for_status()
+    if not partial.stat().st_size:
+        msg = f"Empty response for {name!r}"
+        raise niquests.HTTPError(msg, response=response)
+    partial.replace(output)
+    msg = f"Successful {name!r}"
+    logger.info(msg)
+
 
+def _sha256(fp: Path, /) -> str:
+    with fp.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
-def _write_zip_to_parquet(input_dir: Path, buf: io.BytesIO, /) -> Path:
+
+def _n_rows(fp: Path, /) -> int:
+    return pl.scan_parquet(fp).select(pl.len()).collect().item()
+
+
+def _is_retryable(err: niquests.RequestException, /) -> bool:
+    """Connection errors and some status codes are transient, others are not."""
+    response = err.response
+    return response is None or response.status_code in RETRY_STATUS
+
+
+def _write_zip_to_parquet(input_dir: Path, source: Path, /) -> Path:
     """
     Extract inner ``.csv`` from ``.zip``, write to ``.parquet``of the same name.
 
@@ -938,8 +1298,8 @@ def _write_zip_to_parquet(input_dir: Path, buf: io.BytesIO, /) -> Path:
     ----------
     input_dir
         Directory to store monthly input files.
-    buf
-        Buffer containing the zipped response.
+    source
+        File containing the zipped response.
 
     Notes
     -----
@@ -947,6 +1307,9 @@ def _write_zip_to_parquet(input_dir: Path, buf: io.BytesIO, /) -> Path:
     - Only the subset of columns defined in ``SCAN_SCHEMA`` are preserved
         - Further reduces file size
         - Also, some unused columns contain invalid utf8 values
+    - Memory use is bounded, independent of the size of the ``.csv``
+        - Decompressed to a temporary file in ``CHUNK_SIZE`` pieces
+        - Then *streamed* into ``.parquet`` by ``pl.LazyFrame.sink_parquet``
 
     Original file:
 
@@ -966,31 +1329,46 @@ def _write_zip_to_parquet(input_dir: Path, buf: io.BytesIO, /) -> Path:
         | .zip     | 15_000   | 30_000    |
         | .csv     | 200_000  | 250_000   |
     """
-    zip_csv = next(zipfile.Path(zipfile.ZipFile(buf)).glob("*.csv"))
-    stem = zip_csv.at.replace("(", "").replace(")", "")
-    output = (input_dir / stem).with_suffix(".parquet")
-    output.touch()
-    msg = f"Writing {output.as_posix()!r}"
-    logger.debug(msg)
-    with zip_csv.open("rb") as strm:
+    with tempfile.TemporaryDirectory(dir=input_dir) as temp_dir:
+        with zipfile.ZipFile(source) as zf:
+            zip_csv = next(zipfile.Path(zf).glob("*.csv"))
+            stem = zip_csv.at.replace("(", "").replace(")", "")
+            output = (input_dir / stem).with_suffix(PARQUET)
+            msg = f"Writing {output.as_posix()!r}"
+            logger.debug(msg)
+            csv = Path(temp_dir) / zip_csv.name
+            with zip_csv.open("rb") as src, csv.open("wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
         ldf = pl.scan_csv(
-            strm,
+            csv,
             try_parse_dates=True,
             schema_overrides=SCAN_SCHEMA,
             encoding="utf8-lossy",
         ).select(SCAN_SCHEMA.names())
-    ldf.collect().write_parquet(output, compression="zstd", compression_level=17)
+        temp = Path(temp_dir) / output.name
+        ldf.sink_parquet(temp, compression="zstd", compression_level=17)
+        temp.replace(output)
     return output
 
 
-async def _write_zip_to_parquet_async(input_dir: Path, buf: io.BytesIO, /) -> Path:
+async def _write_zip_to_parquet_async(
+    input_dir: Path, source: Path, executor: Executor, /
+) -> Path:
     """
-    Wraps ``_write_zip_to_parquet`` to run in a separate thread.
+    Wraps ``_write_zip_to_parquet`` to run in a separate thread (or process).
 
     - **Greatly** reduces the cost of the decompress > compress operations
     - During testing, each write would block for ~10s
     """
-    return await asyncio.to_thread(_write_zip_to_parquet, input_dir, buf)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, _write_zip_to_parquet, input_dir, source
+    )
+
+
+def _init_conversion_worker(polars_threads: int, /) -> None:
+    """Size the ``polars`` thread pool of a ``"process"`` worker, before its first use."""
+    os.environ["POLARS_MAX_THREADS"] = str(polars_threads)
 
 
 def _file_stem_source[T: (str, pl.Expr)](year: T, month: T, /) -> pl.Expr:
@@ -1012,12 +1390,23 @@ def _get_args(tp: Any, /) -> tuple[Any, ...]:
 
 def main() -> None:
     logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Generate the flights datasets.")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help=(
+            "Hash every downloaded monthly source, rather than trusting those whose "
+            "size and modification time are unchanged."
+        ),
+    )
+    args = parser.parse_args()
     repo_root = Path(__file__).parent.parent
     source_toml = repo_root / "_data" / "flights.toml"
     app = Flights.from_toml(
         source_toml,
         input_dir=Path.home() / ".vega_datasets",
         output_dir=repo_root / "data",
+        verify_sources=args.verify,
     )
     app.run()
 
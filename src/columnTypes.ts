@@ -0,0 +1,451 @@
+export type ColumnType = { type: "integer" | "number" | "boolean" | "date" | "datetime" | "string"; format?: string };
+
+export default {
+  "airports.csv": {
+    "iata": {
+      "type": "string"
+    },
+    "name": {
+      "type": "string"
+    },
+    "city": {
+      "type": "string"
+    },
+    "state": {
+      "type": "string"
+    },
+    "country": {
+      "type": "string"
+    },
+    "latitude": {
+      "type": "number"
+    },
+    "longitude": {
+      "type": "number"
+    }
+  },
+  "birdstrikes.csv": {
+    "Airport Name": {
+      "type": "string"
+    },
+    "Aircraft Make Model": {
+      "type": "string"
+    },
+    "Effect Amount of damage": {
+      "type": "string"
+    },
+    "Flight Date": {
+      "type": "date"
+    },
+    "Aircraft Airline Operator": {
+      "type": "string"
+    },
+    "Origin State": {
+      "type": "string"
+    },
+    "Phase of flight": {
+      "type": "string"
+    },
+    "Wildlife Size": {
+      "type": "string"
+    },
+    "Wildlife Species": {
+      "type": "string"
+    },
+    "Time of day": {
+      "type": "string"
+    },
+    "Cost Other": {
+      "type": "integer"
+    },
+    "Cost Repair": {
+      "type": "integer"
+    },
+    "Cost Total $": {
+      "type": "integer"
+    },
+    "Speed IAS in knots": {
+      "type": "integer"
+    }
+  },
+  "co2-concentration.csv": {
+    "Date": {
+      "type": "date"
+    },
+    "CO2": {
+      "type": "number"
+    },
+    "adjusted CO2": {
+      "type": "number"
+    }
+  },
+  "disasters.csv": {
+    "Entity": {
+      "type": "string"
+    },
+    "Year": {
+      "type": "integer"
+    },
+    "Deaths": {
+      "type": "integer"
+    }
+  },
+  "flights-airport.csv": {
+    "origin": {
+      "type": "string"
+    },
+    "destination": {
+      "type": "string"
+    },
+    "count": {
+      "type": "integer"
+    }
+  },
+  "gapminder-health-income.csv": {
+    "country": {
+      "type": "string"
+    },
+    "income": {
+      "type": "integer"
+    },
+    "health": {
+      "type": "number"
+    },
+    "population": {
+      "type": "integer"
+    },
+    "region": {
+      "type": "string"
+    }
+  },
+  "github.csv": {
+    "time": {
+      "type": "string"
+    },
+    "count": {
+      "type": "integer"
+    }
+  },
+  "global-temp.csv": {
+    "year": {
+      "type": "integer"
+    },
+    "temp": {
+      "type": "number"
+    }
+  },
+  "iowa-electricity.csv": {
+    "year": {
+      "type": "date"
+    },
+    "source": {
+      "type": "string"
+    },
+    "net_generation": {
+      "type": "integer"
+    }
+  },
+  "la-riots.csv": {
+    "first_name": {
+      "type": "string"
+    },
+    "last_name": {
+      "type": "string"
+    },
+    "age": {
+      "type": "integer"
+    },
+    "gender": {
+      "type": "string"
+    },
+    "race": {
+      "type": "string"
+    },
+    "death_date": {
+      "type": "date"
+    },
+    "address": {
+      "type": "string"
+    },
+    "neighborhood": {
+      "type": "string"
+    },
+    "type": {
+      "type": "string"
+    },
+    "longitude": {
+      "type": "number"
+    },
+    "latitude": {
+      "type": "number"
+    }
+  },
+  "lookup_groups.csv": {
+    "group": {
+      "type": "integer"
+    },
+    "person": {
+      "type": "string"
+    }
+  },
+  "lookup_people.csv": {
+    "name": {
+      "type": "string"
+    },
+    "age": {
+      "type": "integer"
+    },
+    "height": {
+      "type": "integer"
+    }
+  },
+  "population_engineers_hurricanes.csv": {
+    "state": {
+      "type": "string"
+    },
+    "id": {
+      "type": "integer"
+    },
+    "population": {
+      "type": "integer"
+    },
+    "engineers": {
+      "type": "number"
+    },
+    "hurricanes": {
+      "type": "integer"
+    }
+  },
+  "seattle-weather-hourly-normals.csv": {
+    "date": {
+      "type": "datetime"
+    },
+    "pressure": {
+      "type": "number"
+    },
+    "temperature": {
+      "type": "number"
+    },
+    "wind": {
+      "type": "number"
+    }
+  },
+  "seattle-weather.csv": {
+    "date": {
+      "type": "date"
+    },
+    "precipitation": {
+      "type": "number"
+    },
+    "temp_max": {
+      "type": "number"
+    },
+    "temp_min": {
+      "type": "number"
+    },
+    "wind": {
+      "type": "number"
+    },
+    "weather": {
+      "type": "string"
+    }
+  },
+  "sp500-2000.csv": {
+    "date": {
+      "type": "date"
+    },
+    "open": {
+      "type": "number"
+    },
+    "high": {
+      "type": "number"
+    },
+    "low": {
+      "type": "number"
+    },
+    "close": {
+      "type": "number"
+    },
+    "adjclose": {
+      "type": "number"
+    },
+    "volume": {
+      "type": "integer"
+    }
+  },
+  "sp500.csv": {
+    "date": {
+      "type": "date",
+      "format": "%b %d %Y"
+    },
+    "price": {
+      "type": "number"
+    }
+  },
+  "species.csv": {
+    "item_id": {
+      "type": "string"
+    },
+    "common_name": {
+      "type": "string"
+    },
+    "scientific_name": {
+      "type": "string"
+    },
+    "gap_species_code": {
+      "type": "string"
+    },
+    "county_id": {
+      "type": "integer"
+    },
+    "habitat_yearround_pct": {
+      "type": "number"
+    }
+  },
+  "stocks.csv": {
+    "symbol": {
+      "type": "string"
+    },
+    "date": {
+      "type": "date",
+      "format": "%b %d %Y"
+    },
+    "price": {
+      "type": "number"
+    }
+  },
+  "us-employment.csv": {
+    "month": {
+      "type": "date"
+    },
+    "nonfarm": {
+      "type": "integer"
+    },
+    "private": {
+      "type": "integer"
+    },
+    "goods_producing": {
+      "type": "integer"
+    },
+    "service_providing": {
+      "type": "integer"
+    },
+    "private_service_providing": {
+      "type": "integer"
+    },
+    "mining_and_logging": {
+      "type": "integer"
+    },
+    "construction": {
+      "type": "integer"
+    },
+    "manufacturing": {
+      "type": "integer"
+    },
+    "durable_goods": {
+      "type": "integer"
+    },
+    "nondurable_goods": {
+      "type": "integer"
+    },
+    "trade_transportation_utilties": {
+      "type": "integer"
+    },
+    "wholesale_trade": {
+      "type": "number"
+    },
+    "retail_trade": {
+      "type": "number"
+    },
+    "transportation_and_warehousing": {
+      "type": "number"
+    },
+    "utilities": {
+      "type": "number"
+    },
+    "information": {
+      "type": "integer"
+    },
+    "financial_activities": {
+      "type": "integer"
+    },
+    "professional_and_business_services": {
+      "type": "integer"
+    },
+    "education_and_health_services": {
+      "type": "integer"
+    },
+    "leisure_and_hospitality": {
+      "type": "integer"
+    },
+    "other_services": {
+      "type": "integer"
+    },
+    "government": {
+      "type": "integer"
+    },
+    "nonfarm_change": {
+      "type": "integer"
+    }
+  },
+  "weather.csv": {
+    "location": {
+      "type": "string"
+    },
+    "date": {
+      "type": "date"
+    },
+    "precipitation": {
+      "type": "number"
+    },
+    "temp_max": {
+      "type": "number"
+    },
+    "temp_min": {
+      "type": "number"
+    },
+    "wind": {
+      "type": "number"
+    },
+    "weather": {
+      "type": "string"
+    }
+  },
+  "windvectors.csv": {
+    "longitude": {
+      "type": "number"
+    },
+    "latitude": {
+      "type": "number"
+    },
+    "dir": {
+      "type": "integer"
+    },
+    "dirCat": {
+      "type": "integer"
+    },
+    "speed": {
+      "type": "number"
+    }
+  },
+  "zipcodes.csv": {
+    "zip_code": {
+      "type": "integer"
+    },
+    "latitude": {
+      "type": "number"
+    },
+    "longitude": {
+      "type": "number"
+    },
+    "city": {
+      "type": "string"
+    },
+    "state": {
+      "type": "string"
+    },
+    "county": {
+      "type": "string"
+    }
+  }
+} as Record<string, Record<string, ColumnType>>;
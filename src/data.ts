@@ -1,11 +1,13 @@
 import * as d3 from "d3-dsv";
 import pkg from '../package.json';
 import urls from "./urls.js";
-import stringOverrides from "./stringOverrides.js";
+import columnTypes, { type ColumnType } from "./columnTypes.js";
 
 const version = pkg.version;
 type Name = keyof typeof urls;
 
+const ISO_DATE = /^([-+]\d{2})?\d{4}(-\d{2}(-\d{2})?)?(T\d{2}:\d{2}(:\d{2}(\.\d{3})?)?(Z|[-+]\d{2}:\d{2})?)?$/;
+
 // Modified from https://github.com/d3/d3-dsv/blob/a2facce660bb4895b56c62a655d0f252efc3d99f/src/autoType.js to add skipFields.
 // Original code is Copyright 2013-2021 Mike Bostock.
 function autoType(object: Record<string, any>, skipFields?: Set<string>) {
@@ -17,9 +19,34 @@ function autoType(object: Record<string, any>, skipFields?: Set<string>) {
     else if (value === "false") value = false;
     else if (value === "NaN") value = NaN;
     else if (!isNaN(number = +value)) value = number;
-    else if (m = value.match(/^([-+]\d{2})?\d{4}(-\d{2}(-\d{2})?)?(T\d{2}:\d{2}(:\d{2}(\.\d{3})?)?(Z|[-+]\d{2}:\d{2})?)?$/)) {
+    else if (m = value.match(ISO_DATE)) {
+      value = new Date(value);
+    }
+    else continue;
+    object[key] = value;
+  }
+  return object;
+}
+
+// Converts each cell using the type of its column (from datapackage.json), rather than trying
+// every conversion per cell. Cells that match their column type get the same value as autoType;
+// others, and dates with a non-ISO format, are left as strings.
+function typedParse(object: Record<string, any>, columns: Record<string, ColumnType>) {
+  for (const key in object) {
+    const column = columns[key];
+    if (!column || column.type === "string") continue;
+    let value = object[key].trim(), number;
+    if (!value) value = null;
+    else if (column.type === "boolean") {
+      if (value === "true") value = true;
+      else if (value === "false") value = false;
+      else continue;
+    }
+    else if (column.type === "date" || column.type === "datetime") {
+      if (column.format || !ISO_DATE.test(value)) continue;
       value = new Date(value);
     }
+    else if (!isNaN(number = +value) || value === "NaN") value = number;
     else continue;
     object[key] = value;
   }
@@ -39,8 +66,13 @@ for (const name of Object.keys(urls) as Name[]) {
       return await result.json();
     } else if (name.endsWith(".csv")) {
       const text = await result.text();
-      const skipFields = stringOverrides[name] ? new Set(stringOverrides[name]) : undefined;
-      return d3.csvParse(text, (row) => autoType(row, skipFields));
+      const columns = columnTypes[name];
+      if (columns) {
+        // Columns without a known type fall back to autoType
+        const typedFields = new Set(Object.keys(columns));
+        return d3.csvParse(text, (row) => autoType(typedParse(row, columns), typedFields));
+      }
+      return d3.csvParse(text, (row) => autoType(row));
     } else {
       return await result.text();
     }
@@ -1,76 +0,0 @@
-export default {
-  "airports.csv": [
-    "iata",
-    "name",
-    "city",
-    "state",
-    "country"
-  ],
-  "birdstrikes.csv": [
-    "Airport Name",
-    "Aircraft Make Model",
-    "Effect Amount of damage",
-    "Aircraft Airline Operator",
-    "Origin State",
-    "Phase of flight",
-    "Wildlife Size",
-    "Wildlife Species",
-    "Time of day"
-  ],
-  "disasters.csv": [
-    "Entity"
-  ],
-  "flights-airport.csv": [
-    "origin",
-    "destination"
-  ],
-  "gapminder-health-income.csv": [
-    "country",
-    "region"
-  ],
-  "github.csv": [
-    "time"
-  ],
-  "iowa-electricity.csv": [
-    "source"
-  ],
-  "la-riots.csv": [
-    "first_name",
-    "last_name",
-    "gender",
-    "race",
-    "address",
-    "neighborhood",
-    "type"
-  ],
-  "lookup_groups.csv": [
-    "person"
-  ],
-  "lookup_people.csv": [
-    "name"
-  ],
-  "population_engineers_hurricanes.csv": [
-    "state"
-  ],
-  "seattle-weather.csv": [
-    "weather"
-  ],
-  "species.csv": [
-    "item_id",
-    "common_name",
-    "scientific_name",
-    "gap_species_code"
-  ],
-  "stocks.csv": [
-    "symbol"
-  ],
-  "weather.csv": [
-    "location",
-    "weather"
-  ],
-  "zipcodes.csv": [
-    "city",
-    "state",
-    "county"
-  ]
-} as Record<string, string[]>;
@@ -1,18 +1,72 @@
 """
-Pytest config: ``--runslow`` and ``--limit-rows`` CLI options.
+Pytest config: ``--runslow``, ``--limit-rows``, ``--validator``, ``--no-cache``, ``--shard`` and ``--runbench`` CLI options.
 
-The ``slow`` marker is registered in ``pyproject.toml``
+The ``slow`` and ``benchmark`` markers are registered in ``pyproject.toml``
 (``[tool.pytest.ini_options].markers``), matching the convention used in
 vega/altair. The expected-failures allowlist is read at parametrize time
 inside ``test_datapackage.py`` (so xfail marks attach by resource-dict
 lookup, not by ID-string parsing of pytest's test names) — that logic
 does not live here either.
+
+The ``bdp`` and ``flights`` fixtures import ``scripts/build_datapackage.py`` and
+``scripts/flights.py``, via ``load_script``.
 """
 
 from __future__ import annotations
 
+import argparse
+import importlib.util
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
 import pytest
 
+if TYPE_CHECKING:
+    from types import ModuleType
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+
+OPT_IN_MARKERS = {"slow": "--runslow", "benchmark": "--runbench"}
+"""Markers whose items are skipped unless the corresponding option is passed."""
+
+
+def _int_list(s: str) -> list[int]:
+    return [int(n) for n in s.split(",")]
+
+
+def _shard(s: str) -> tuple[int, int]:
+    i, _, n = s.partition("/")
+    if not (i.isdigit() and n.isdigit() and 1 <= int(i) <= int(n)):
+        msg = f"expected i/n with 1 <= i <= n, but got: {s!r}"
+        raise argparse.ArgumentTypeError(msg)
+    return int(i), int(n)
+
+
+def _item_bytes(item: pytest.Item) -> int:
+    """Declared ``bytes`` of the resource an item validates, the cost of running it."""
+    callspec = getattr(item, "callspec", None)
+    resource = callspec.params.get("resource", {}) if callspec else {}
+    return resource.get("bytes") or 0
+
+
+def shard_items(items: list[pytest.Item], n: int, /) -> list[list[pytest.Item]]:
+    """
+    Split ``items`` into ``n`` shards of near-equal total ``_item_bytes``.
+
+    Greedy (largest-first) bin packing: each item goes to the currently
+    lightest shard, which keeps the heaviest shard within one item of the
+    ideal ``total / n``. Ties are broken by ``nodeid``, so every process
+    computes the same shards.
+    """
+    shards: list[list[pytest.Item]] = [[] for _ in range(n)]
+    loads = [0] * n
+    for item in sorted(items, key=lambda it: (-_item_bytes(it), it.nodeid)):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(item)
+        loads[lightest] += _item_bytes(item)
+    return shards
+
 
 def pytest_addoption(parser: pytest.Parser) -> None:
     parser.addoption(
@@ -31,6 +85,97 @@ def pytest_addoption(parser: pytest.Parser) -> None:
             "iteration; flights-3m takes minutes at full read."
         ),
     )
+    parser.addoption(
+        "--validator",
+        choices=("frictionless", "polars"),
+        default="frictionless",
+        help=(
+            "Engine for --runslow tests: frictionless (row-wise, the reference) or "
+            "polars (column-wise, seconds for every resource). Default: frictionless."
+        ),
+    )
+    parser.addoption(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help=(
+            "Re-validate every resource in --runslow tests, including those that "
+            "passed a previous run and have not changed since."
+        ),
+    )
+    parser.addoption(
+        "--shard",
+        type=_shard,
+        default=None,
+        metavar="i/n",
+        help=(
+            "Only run the i-th of n size-balanced shards of the --runslow tests, "
+            "e.g. one per CI job. Other tests run in every shard."
+        ),
+    )
+    group = parser.getgroup("benchmark", "datapackage build benchmarks")
+    group.addoption(
+        "--runbench",
+        action="store_true",
+        default=False,
+        help="Run @pytest.mark.benchmark tests (scripts/build_datapackage.py).",
+    )
+    group.addoption(
+        "--bench-resources",
+        type=_int_list,
+        default=[10, 100],
+        metavar="N[,N...]",
+        help="Number of resources in each synthetic data/ directory. Default: 10,100.",
+    )
+    group.addoption(
+        "--bench-bytes",
+        type=int,
+        default=1_000_000,
+        metavar="BYTES",
+        help="Approximate size of each synthetic data file. Default: 1_000_000.",
+    )
+    group.addoption(
+        "--bench-rounds",
+        type=int,
+        default=3,
+        help="Timed rounds per benchmark, after one (traced) warmup. Default: 3.",
+    )
+    group.addoption(
+        "--bench-output",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Write results as JSON. Default: .benchmarks/<commit>.json.",
+    )
+    group.addoption(
+        "--bench-compare",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Print the change in time and memory, relative to a previous --bench-output.",
+    )
+
+
+def load_script(name: str, /) -> ModuleType:
+    """Import ``scripts/{name}.py`` as a module (``scripts/`` is not a package)."""
+    if module := sys.modules.get(name):
+        return module
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def bdp() -> ModuleType:
+    return load_script("build_datapackage")
+
+
+@pytest.fixture(scope="session")
+def flights() -> ModuleType:
+    return load_script("flights")
 
 
 @pytest.fixture(scope="session")
@@ -38,13 +183,48 @@ def schema_limit_rows(request: pytest.FixtureRequest) -> int | None:
     return request.config.getoption("--limit-rows")
 
 
+@pytest.fixture(scope="session")
+def validator(request: pytest.FixtureRequest) -> str:
+    return request.config.getoption("--validator")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("--shard") and not config.getoption("--runslow"):
+        msg = "--shard only splits the --runslow tests, so requires --runslow"
+        raise pytest.UsageError(msg)
+
+
 def pytest_collection_modifyitems(
     config: pytest.Config, items: list[pytest.Item]
 ) -> None:
-    """Skip ``slow`` items unless ``--runslow`` was passed."""
+    """Skip ``slow`` and ``benchmark`` items unless opted in, then shard ``slow`` items."""
+    for marker, option in OPT_IN_MARKERS.items():
+        if config.getoption(option):
+            continue
+        skip = pytest.mark.skip(reason=f"opt in with {option}")
+        for item in items:
+            if marker in item.keywords:
+                item.add_marker(skip)
     if config.getoption("--runslow"):
+        _schedule_slow(config, items)
+
+
+def _schedule_slow(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """
+    Run ``slow`` items largest-first, keeping only this ``--shard``.
+
+    Largest-first also balances ``pytest-xdist``, whose ``--dist load``
+    hands out items in collection order as workers become idle.
+    """
+    slow = [item for item in items if "slow" in item.keywords]
+    if not slow:
         return
-    skip_slow = pytest.mark.skip(reason="opt in with --runslow")
-    for item in items:
-        if "slow" in item.keywords:
-            item.add_marker(skip_slow)
+    first = items.index(slow[0])
+    others = [item for item in items if "slow" not in item.keywords]
+    if shard := config.getoption("--shard"):
+        i, n = shard
+        selected = set(shard_items(slow, n)[i - 1])
+        config.hook.pytest_deselected(items=[it for it in slow if it not in selected])
+        slow = [it for it in slow if it in selected]
+    slow.sort(key=lambda it: (-_item_bytes(it), it.nodeid))
+    items[:] = [*others[:first], *slow, *others[first:]]
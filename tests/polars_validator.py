@@ -0,0 +1,423 @@
+"""
+Column-wise schema and row validation of a single resource, using `polars`_.
+
+An alternative to ``frictionless`` row validation for the slow tier of
+``test_datapackage.py``, selected with ``pytest --runslow --validator polars``.
+Each file is read once and every field is checked as a whole column, so
+validating all resources takes seconds rather than minutes.
+
+Errors mirror the ``type``, ``field_name`` and ``note`` that ``frictionless``
+reports for the same data:
+
+* Labels — ``extra-label``, ``missing-label``, ``blank-label``,
+  ``duplicate-label`` and ``incorrect-label``.
+* Cells — ``type-error`` for each field ``type``/``format``, ``constraint-error``
+  for ``required``, ``enum``, ``minimum``, ``maximum``, ``minLength``,
+  ``maxLength`` and ``pattern``, and ``unique-error``.
+* Files — ``source-error`` when a file is missing or cannot be parsed.
+
+Rows of a delimited file with fewer cells than labels are read as if padded
+with empty cells, so are not reported as ``missing-cell``.
+Field types, formats and constraints that ``datapackage.json`` does not use
+raise ``UnsupportedField``, and ``test_schema_and_rows`` validates those
+resources with ``frictionless`` instead.
+
+.. _polars:
+    https://docs.pola.rs/
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import polars as pl
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+    from pathlib import Path
+
+DEFAULT_MISSING_VALUES = [""]
+DEFAULT_TRUE_VALUES = ["true", "True", "TRUE", "1"]
+DEFAULT_FALSE_VALUES = ["false", "False", "FALSE", "0"]
+DEFAULT_DATE_FORMAT = "%Y-%m-%d"
+LIMIT_ERRORS = 1000
+"""Errors reported per resource, matching the ``frictionless`` default."""
+FIRST_ROW_NUMBER = 2
+"""Row number of the first row of data, following the row of labels."""
+
+CELLS_SCHEMA = pl.Schema({"kind": pl.String, "text": pl.String, "number": pl.Float64})
+"""
+Each field is read into cells of this schema, independent of the file format.
+
+``kind`` is the type a cell was parsed as (see ``JSON_KINDS`` and ``dtype_kind``),
+strings and temporal values are held in ``text``, numbers and booleans in ``number``.
+"""
+JSON_KINDS: Mapping[type, str] = {
+    str: "str",
+    int: "int",
+    float: "float",
+    bool: "bool",
+    type(None): "null",
+}
+NUMBER_KINDS = ("int", "float")
+
+
+class UnsupportedField(Exception):
+    """A file type, field type, format or constraint that is checked by ``frictionless`` instead."""
+
+
+class ValidationError(NamedTuple):
+    """Shares the attributes of ``frictionless`` errors that ``test_schema_and_rows`` renders."""
+
+    type: str
+    note: str
+    field_name: str | None = None
+    row_number: int | None = None
+
+
+def validate_resource(
+    resource: Mapping[str, Any], data_dir: Path, /, *, limit_rows: int | None = None
+) -> list[ValidationError]:
+    """
+    Validate the file of ``resource`` against its schema.
+
+    Parameters
+    ----------
+    resource
+        Resource descriptor, from ``datapackage.json``.
+    data_dir
+        Directory that ``resource["path"]`` is relative to.
+    limit_rows
+        Only validate the first N rows.
+
+    Returns
+    -------
+    Up to ``LIMIT_ERRORS`` errors in row order, preceded by those of the labels.
+    """
+    path = data_dir / resource["path"]
+    if not path.exists():
+        return [ValidationError("source-error", str(path))]
+    try:
+        if resource.get("type") != "table" or "schema" not in resource:
+            if path.suffix == ".json":
+                json.loads(path.read_bytes())
+            return []
+        labels, cells = read_cells(path, resource, limit_rows=limit_rows)
+    except (OSError, TypeError, ValueError, pl.exceptions.PolarsError) as err:
+        return [ValidationError("source-error", str(err))]
+    schema = resource["schema"]
+    missing_values = schema.get("missingValues", DEFAULT_MISSING_VALUES)
+    errors = list(iter_label_errors(labels, schema["fields"]))
+    for field, frame in zip(schema["fields"], cells, strict=False):
+        errors.extend(iter_cell_errors(field, with_missing(frame, missing_values)))
+    # NOTE: Within a row, `frictionless` checks uniqueness after every cell
+    errors.sort(key=lambda err: (err.row_number or 0, err.type == "unique-error"))
+    return errors[:LIMIT_ERRORS]
+
+
+def read_cells(
+    path: Path, resource: Mapping[str, Any], /, *, limit_rows: int | None = None
+) -> tuple[list[str], list[pl.DataFrame]]:
+    """Read the labels of ``path``, and the ``CELLS_SCHEMA`` frame under each of them."""
+    match path.suffix:
+        case ".csv" | ".tsv":
+            return _read_delimited(path, resource, limit_rows)
+        case ".json":
+            return _read_json(path, limit_rows)
+        case ".parquet":
+            return _read_frame(pl.read_parquet(path, n_rows=limit_rows))
+        case ".arrow":
+            return _read_frame(pl.read_ipc(path, n_rows=limit_rows, memory_map=False))
+        case suffix:
+            msg = f"Unsupported file type {suffix!r}, falling back to frictionless"
+            raise UnsupportedField(msg)
+
+
+def to_cells(values: Sequence[Any], /) -> pl.DataFrame:
+    """Cells of decoded ``.json`` values, preserving whether each was a string, number, etc."""
+    return pl.DataFrame(
+        {
+            "kind": [JSON_KINDS.get(type(v), "other") for v in values],
+            "text": [v if type(v) is str else None for v in values],
+            "number": [v if type(v) in {int, float, bool} else None for v in values],
+        },
+        schema=CELLS_SCHEMA,
+        strict=False,
+    )
+
+
+def dtype_kind(dtype: pl.DataType, /) -> str:
+    if dtype.is_integer():
+        return "int"
+    if dtype.is_float():
+        return "float"
+    if dtype == pl.Boolean:
+        return "bool"
+    if dtype in {pl.String, pl.Categorical, pl.Enum}:
+        return "str"
+    if dtype == pl.Date:
+        return "date"
+    if dtype == pl.Datetime:
+        return "datetime"
+    return "other"
+
+
+def _read_delimited(
+    path: Path, resource: Mapping[str, Any], limit_rows: int | None, /
+) -> tuple[list[str], list[pl.DataFrame]]:
+    default = "\t" if path.suffix == ".tsv" else ","
+    delimiter = resource.get("dialect", {}).get("csv", {}).get("delimiter", default)
+    with path.open(encoding=resource.get("encoding", "utf-8"), newline="") as f:
+        labels = next(csv.reader(f, delimiter=delimiter), [])
+    frame = pl.read_csv(
+        path, separator=delimiter, infer_schema=False, n_rows=limit_rows
+    )
+    return labels, [_cells_of(column, "str") for column in frame.iter_columns()]
+
+
+def _read_json(
+    path: Path, limit_rows: int | None, /
+) -> tuple[list[str], list[pl.DataFrame]]:
+    rows = json.loads(path.read_bytes())
+    if not isinstance(rows, list):
+        msg = f"Expected an array of rows, but got {type(rows).__name__!r}"
+        raise TypeError(msg)
+    if rows and isinstance(rows[0], dict):
+        labels = list(rows[0])
+        body = rows[:limit_rows]
+        columns = [[row.get(label) for row in body] for label in labels]
+    else:
+        labels, *body = rows[: None if limit_rows is None else limit_rows + 1] or [[]]
+        columns = [
+            [row[idx] if idx < len(row) else None for row in body]
+            for idx in range(len(labels))
+        ]
+    return [str(label) for label in labels], [to_cells(values) for values in columns]
+
+
+def _read_frame(frame: pl.DataFrame, /) -> tuple[list[str], list[pl.DataFrame]]:
+    cells = [
+        _cells_of(column, dtype_kind(column.dtype)) for column in frame.iter_columns()
+    ]
+    return frame.columns, cells
+
+
+def _cells_of(column: pl.Series, kind: str, /) -> pl.DataFrame:
+    is_number = kind in {*NUMBER_KINDS, "bool"}
+    # NOTE: Filtering columns with different numbers of chunks can panic
+    return (
+        pl.DataFrame({"value": column.rechunk()})
+        .select(
+            kind=pl.when(pl.col("value").is_null())
+            .then(pl.lit("null"))
+            .otherwise(pl.lit(kind)),
+            text=None if is_number else pl.col("value").cast(pl.String),
+            number=pl.col("value").cast(pl.Float64) if is_number else None,
+        )
+        .cast(dict(CELLS_SCHEMA))
+    )
+
+
+def with_missing(cells: pl.DataFrame, missing_values: Sequence[str], /) -> pl.DataFrame:
+    """Treat strings in ``missing_values`` as missing (``"null"``), like ``frictionless``."""
+    is_missing = (pl.col("kind") == "str") & pl.col("text").is_in(missing_values)
+    return cells.with_columns(
+        kind=pl.when(is_missing).then(pl.lit("null")).otherwise("kind")
+    )
+
+
+def iter_label_errors(
+    labels: Sequence[str], fields: Sequence[Mapping[str, Any]], /
+) -> Iterator[ValidationError]:
+    names = [field["name"] for field in fields]
+    for _ in labels[len(names) :]:
+        yield ValidationError("extra-label", "", "")
+    for name in names[len(labels) :]:
+        yield ValidationError("missing-label", "", name)
+    for idx, (name, label) in enumerate(zip(names, labels, strict=False)):
+        if not label:
+            yield ValidationError("blank-label", "", name)
+        elif duplicates := [
+            n for n, seen in enumerate(labels[:idx], 1) if seen == label
+        ]:
+            note = f'at position "{", ".join(map(str, duplicates))}"'
+            yield ValidationError("duplicate-label", note, name)
+        elif label.replace("\n", " ").strip() != name:
+            yield ValidationError("incorrect-label", "", name)
+
+
+def iter_cell_errors(
+    field: Mapping[str, Any], cells: pl.DataFrame, /
+) -> Iterator[ValidationError]:
+    """
+    Check every cell of ``field`` in one query.
+
+    As in ``frictionless``, constraints are only checked for cells without a ``type-error``.
+    """
+    name = field["name"]
+    value = cast_cells(field)
+    is_type_error = (pl.col("kind") != "null") & value.is_null()
+    type_note = f'type is "{field["type"]}/{field.get("format", "default")}"'
+    checks = {"type-error": (type_note, is_type_error)}
+    constraints = field.get("constraints", {})
+    for constraint, is_error in iter_constraint_errors(field, value):
+        note = f'constraint "{constraint}" is "{constraints[constraint]}"'
+        checks[constraint] = (note, is_error & ~is_type_error)
+    # NOTE: `frictionless` reports the previous row with the same value
+    previous = pl.lit(None, pl.Int64)
+    if constraints.get("unique"):
+        previous = pl.when(~is_type_error).then(pl.col("row").shift().over(value))
+        checks["unique"] = ("", value.is_not_null() & previous.is_not_null())
+    failed = (
+        cells.with_row_index("row", FIRST_ROW_NUMBER)
+        .select(
+            "row",
+            previous.alias("previous"),
+            *(is_error.alias(check) for check, (_, is_error) in checks.items()),
+        )
+        .filter(pl.any_horizontal(checks))
+    )
+    for check, (note, _) in checks.items():
+        rows = failed.filter(check).select("row", "previous")
+        for row_number, previous_number in rows.iter_rows():
+            if check == "type-error":
+                yield ValidationError(check, note, name, row_number)
+            elif check == "unique":
+                note = f"the same as in the row at position {previous_number}"
+                yield ValidationError("unique-error", note, name, row_number)
+            else:
+                yield ValidationError("constraint-error", note, name, row_number)
+
+
+def iter_constraint_errors(
+    field: Mapping[str, Any], value: pl.Expr, /
+) -> Iterator[tuple[str, pl.Expr]]:
+    """Yield each constraint of ``field`` and the cells of ``value`` that fail it."""
+    is_value = value.is_not_null()
+    for constraint, expected in field.get("constraints", {}).items():
+        match constraint:
+            case "required":
+                yield constraint, pl.lit(expected) & (pl.col("kind") == "null")
+            case "enum":
+                yield constraint, is_value & ~value.is_in(cast_values(field, expected))
+            case "minimum":
+                yield constraint, is_value & (value < cast_values(field, [expected])[0])
+            case "maximum":
+                yield constraint, is_value & (value > cast_values(field, [expected])[0])
+            case "minLength":
+                yield constraint, is_value & (value.str.len_chars() < expected)
+            case "maxLength":
+                yield constraint, is_value & (value.str.len_chars() > expected)
+            case "pattern":
+                yield constraint, is_value & ~value.str.contains(f"^(?:{expected})$")
+            case "unique":
+                continue
+            case _:
+                msg = f"Unsupported constraint {constraint!r}, falling back to frictionless"
+                raise UnsupportedField(msg)
+
+
+def cast_values(field: Mapping[str, Any], values: Sequence[Any], /) -> pl.Series:
+    """Cast constraint ``values`` like the cells of ``field``, as ``frictionless`` does."""
+    return to_cells(values).select(cast_cells(field)).to_series()
+
+
+def cast_cells(field: Mapping[str, Any], /) -> pl.Expr:
+    """
+    Expression casting ``CELLS_SCHEMA`` cells to the type of ``field``.
+
+    Follows the ``value_reader`` of each ``frictionless`` field type, where any
+    present cell that casts to null is a ``type-error``.
+    """
+    kind, text, number = pl.col("kind"), pl.col("text"), pl.col("number")
+    tp, fmt = field["type"], field.get("format", "default")
+    match tp, fmt:
+        case "any", _:
+            return pl.when(kind != "null").then(kind)
+        case "string", "default":
+            return pl.when(kind == "str").then(text)
+        case "integer", _:
+            integer = _number_text(text, field, group=False).cast(
+                pl.Int64, strict=False
+            )
+            return (
+                pl.when(kind == "str")
+                .then(integer)
+                .when(kind.is_in(NUMBER_KINDS) & (number == number.floor()))
+                .then(number.cast(pl.Int64))
+            )
+        case "number", _:
+            return (
+                pl.when(kind == "str")
+                .then(_number_text(text, field).cast(pl.Float64, strict=False))
+                .when(kind.is_in(NUMBER_KINDS))
+                .then(number)
+            )
+        case "boolean", _:
+            mapping = dict.fromkeys(field.get("trueValues", DEFAULT_TRUE_VALUES), True)
+            mapping |= dict.fromkeys(
+                field.get("falseValues", DEFAULT_FALSE_VALUES), False
+            )
+            return (
+                pl.when(kind == "bool")
+                .then(number == 1)
+                .when(kind == "str")
+                .then(
+                    text.replace_strict(mapping, default=None, return_dtype=pl.Boolean)
+                )
+            )
+        case "year", _:
+            year = (
+                pl.when((kind == "str") & (text.str.len_chars() == 4))
+                .then(text.cast(pl.Int64, strict=False))
+                .when(kind == "int")
+                .then(number.cast(pl.Int64))
+            )
+            return pl.when(year.is_between(0, 9999)).then(year)
+        case "date", _ if fmt != "any":
+            pattern = DEFAULT_DATE_FORMAT if fmt == "default" else fmt
+            return (
+                pl.when(kind == "date")
+                .then(text.str.to_date(DEFAULT_DATE_FORMAT, strict=False))
+                .when(kind == "str")
+                .then(text.str.to_date(pattern, strict=False))
+            )
+        case "datetime", _ if fmt != "any":
+            # NOTE: ISO 8601 (to the second), with any separator, like `dateutil.parser.isoparse`
+            iso = text.str.slice(0, 10) + "T" + text.str.slice(11, 8)
+            is_iso = text.str.contains(r"^\d{4}-\d{2}-\d{2}.\d{2}:\d{2}:\d{2}")
+            default = pl.when(is_iso).then(
+                iso.str.to_datetime("%Y-%m-%dT%H:%M:%S", strict=False)
+            )
+            if fmt == "default":
+                return pl.when(kind.is_in(("str", "datetime"))).then(default)
+            custom = text.str.to_datetime(fmt, strict=False)
+            return (
+                pl.when(kind == "datetime")
+                .then(default)
+                .when(kind == "str")
+                .then(custom)
+            )
+        case _:
+            msg = f"Unsupported field type {tp}/{fmt}, falling back to frictionless"
+            raise UnsupportedField(msg)
+
+
+def _number_text(
+    text: pl.Expr, field: Mapping[str, Any], /, *, group: bool = True
+) -> pl.Expr:
+    """Apply the ``bareNumber``, ``groupChar`` and ``decimalChar`` of ``field`` to ``text``."""
+    text = text.str.strip_chars()
+    if not field.get("bareNumber", True):
+        text = text.str.replace_all(r"((^[^-\d]*)|(\D*$))", "")
+    if not group:
+        return text
+    if group_char := field.get("groupChar"):
+        text = text.str.replace_all(group_char, "", literal=True)
+    if (decimal_char := field.get("decimalChar", ".")) != ".":
+        text = pl.when(~text.str.contains(".", literal=True)).then(
+            text.str.replace_all(decimal_char, ".", literal=True)
+        )
+    return text
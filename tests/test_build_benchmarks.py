@@ -0,0 +1,442 @@
+r"""
+Benchmark ``scripts/build_datapackage.py`` against synthetic ``data/`` directories.
+
+Opt in with ``pytest --runbench``. Everything runs offline: each session
+generates a throwaway repo tree (``data/``, ``_data/datapackage_additions.toml``,
+``package.json``) holding ``--bench-resources`` files of roughly
+``--bench-bytes`` each, cycling through every supported file type.
+
+Each benchmark runs one warmup round under ``tracemalloc`` (recording the
+peak of Python-level allocations), then ``--bench-rounds`` timed rounds.
+``tracemalloc`` does not see allocations made by polars (Rust), so ``main``
+is also run once in a fresh subprocess, recording its ``peak_rss``.
+Results are written as JSON to ``--bench-output`` (default
+``.benchmarks/<commit>.json``); pass a previous file to ``--bench-compare``
+to print the relative change per benchmark, in time and ``peak_rss``.
+
+Scaling up, e.g. 1000 resources of ~1 GB::
+
+    uv run pytest tests/test_build_benchmarks.py --runbench \\
+        --bench-resources 10,100,1000 --bench-bytes 1_000_000_000
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import platform
+import statistics
+import subprocess as sp
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+    from types import ModuleType
+
+REPO = Path(__file__).resolve().parent.parent
+
+FILE_TYPES = ("csv", "tsv", "json", "parquet", "arrow", "geojson", "png")
+"""Synthetic variants, ``"geojson"`` is written with a ``.json`` extension."""
+
+PNG_1X1 = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d4944415478da63f8ffff3f0005fe02fea7d6a4e200"
+    "00000049454e44ae426082"
+)
+
+PACKAGE_ADDITIONS: dict[str, Any] = {
+    "description": "Synthetic datasets.",
+    "licenses": [{"name": "BSD-3-Clause", "path": "https://example.com/license"}],
+    "contributors": [{"title": "Benchmark", "path": "https://example.com"}],
+}
+"""Package-level metadata, normally from ``_data/datapackage_additions.toml``."""
+
+NPM_PACKAGE: dict[str, Any] = {
+    "name": "synthetic",
+    "version": "0.0.0",
+    "repository": {"url": "https://example.com/synthetic.git"},
+    "author": {"name": "Benchmark", "url": "https://example.com"},
+}
+
+RUN_MAIN = """\
+import importlib.util, json, sys
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location("build_datapackage", sys.argv[1])
+bdp = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = bdp
+spec.loader.exec_module(bdp)
+bdp.main(repo_dir=Path(sys.argv[2]), use_cache=sys.argv[3] == "1")
+print(json.dumps(bdp._peak_rss()))
+"""
+"""
+Run by ``python -c``, with the arguments ``<script> <repo_dir> <use_cache>``.
+
+Prints the peak resident set size of the process, in bytes.
+"""
+
+pytestmark = pytest.mark.benchmark
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "n_resources" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--bench-resources")
+        metafunc.parametrize("n_resources", sizes, ids=[f"n{n}" for n in sizes])
+
+
+class Recorder:
+    """Times a callable over several rounds, collecting results for the session."""
+
+    def __init__(self, rounds: int, /) -> None:
+        self.rounds: int = rounds
+        self.results: list[dict[str, Any]] = []
+
+    def __call__(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        /,
+        *,
+        isolated: Sequence[str] = (),
+        **params: Any,
+    ) -> dict[str, Any]:
+        """
+        Record ``fn``, and the ``peak_rss`` of running ``isolated`` in a subprocess.
+
+        ``isolated`` is the command line of a process doing the same work as ``fn``,
+        which prints its peak resident set size as the last line of ``stdout``.
+        """
+        tracemalloc.start()
+        try:
+            fn()
+            _, py_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        walls: list[float] = []
+        cpus: list[float] = []
+        for _ in range(self.rounds):
+            wall, cpu = time.perf_counter(), time.process_time()
+            fn()
+            walls.append(time.perf_counter() - wall)
+            cpus.append(time.process_time() - cpu)
+        result = {
+            "name": name,
+            "params": params,
+            "rounds": self.rounds,
+            "wall_min": min(walls),
+            "wall_median": statistics.median(walls),
+            "cpu_median": statistics.median(cpus),
+            "py_peak_alloc": py_peak,
+            "peak_rss": _isolated_peak_rss(isolated) if isolated else None,
+        }
+        self.results.append(result)
+        return result
+
+
+def _isolated_peak_rss(args: Sequence[str], /) -> int | None:
+    out = sp.run(args, cwd=REPO, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def _result_key(result: dict[str, Any]) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]"
+
+
+def _git_commit() -> str:
+    try:
+        out = sp.run(
+            ("git", "rev-parse", "--short", "HEAD"),
+            cwd=REPO,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except (OSError, sp.CalledProcessError):
+        return "unknown"
+    return out.stdout.strip()
+
+
+def _compare(previous: Path, results: list[dict[str, Any]]) -> list[str]:
+    before = {
+        _result_key(r): r
+        for r in json.loads(previous.read_text(encoding="utf-8"))["results"]
+    }
+    lines = [f"{'benchmark':<60} {'wall':>9} {'peak rss':>9}"]
+    for result in results:
+        key = _result_key(result)
+        if old := before.get(key):
+            wall = result["wall_median"] / old["wall_median"] - 1
+            if result["peak_rss"] and old.get("peak_rss"):
+                rss = f"{result['peak_rss'] / old['peak_rss'] - 1:>+9.1%}"
+            else:
+                rss = f"{'-':>9}"
+            lines.append(f"{key:<60} {wall:>+9.1%} {rss}")
+        else:
+            lines.append(f"{key:<60} {'new':>9} {'new':>9}")
+    return lines
+
+
+@pytest.fixture(scope="session")
+def bench(request: pytest.FixtureRequest) -> Iterator[Recorder]:
+    config = request.config
+    recorder = Recorder(config.getoption("--bench-rounds"))
+    yield recorder
+    if not recorder.results:
+        return
+    commit = _git_commit()
+    output: Path = config.getoption("--bench-output") or (
+        REPO / ".benchmarks" / f"{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "commit": commit,
+        "created": dt.datetime.now(dt.UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "bytes_per_file": config.getoption("--bench-bytes"),
+        "results": recorder.results,
+    }
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    lines = [f"benchmark results written to {output}"]
+    if previous := config.getoption("--bench-compare"):
+        lines.extend(_compare(previous, recorder.results))
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    for line in lines:
+        reporter.write_line(line)
+
+
+def write_synthetic(fp: Path, kind: str, n_bytes: int, /) -> Path:
+    """Write a file of ``kind``, scaled up from a sample to roughly ``n_bytes``."""
+    if kind == "png":
+        fp.write_bytes(PNG_1X1)
+        return fp
+    sample = 1_000
+    _write_rows(fp, kind, sample)
+    n_rows = max(1, n_bytes * sample // max(fp.stat().st_size, 1))
+    _write_rows(fp, kind, n_rows)
+    return fp
+
+
+def _write_rows(fp: Path, kind: str, n_rows: int, /) -> None:
+    import polars as pl  # noqa: PLC0415
+
+    idx = pl.int_range(n_rows)
+    df = pl.select(
+        id=idx,
+        value=(idx * 7919 % 100_000) / 100,
+        category=pl.format("category-{}", idx % 17),
+        date=pl.date(2000, 1, 1) + pl.duration(days=idx % 3650),
+        flag=idx % 3 == 0,
+    )
+    match kind:
+        case "csv":
+            df.write_csv(fp)
+        case "tsv":
+            df.write_csv(fp, separator="\t")
+        case "json":
+            df.write_json(fp)
+        case "parquet":
+            df.write_parquet(fp)
+        case "arrow":
+            df.write_ipc(fp)
+        case "geojson":
+            features = [
+                {
+                    "type": "Feature",
+                    "geometry": {
+                        "type": "Point",
+                        "coordinates": [i % 360 - 180, i % 180 - 90],
+                    },
+                    "properties": {"id": i, "category": f"category-{i % 17}"},
+                }
+                for i in range(n_rows)
+            ]
+            collection = {"type": "FeatureCollection", "features": features}
+            fp.write_text(json.dumps(collection), encoding="utf-8")
+        case _:
+            raise TypeError(kind)
+
+
+def _file_name(i: int, kind: str, /) -> str:
+    ext = "json" if kind == "geojson" else kind
+    return f"synthetic-{kind}-{i:04d}.{ext}"
+
+
+def make_repo(root: Path, n_resources: int, n_bytes: int, /) -> Path:
+    """
+    Create a tree that ``build_datapackage.main(repo_dir=...)`` can run on.
+
+    Every tabular resource gets an entry in ``datapackage_additions.toml``,
+    including field descriptions so that ``merge_schemas`` is exercised.
+    """
+    import tomli_w  # noqa: PLC0415
+
+    data = root / "data"
+    data.mkdir(parents=True)
+    (root / "_data").mkdir()
+    (root / "src").mkdir()
+    resources = []
+    for i in range(n_resources):
+        kind = FILE_TYPES[i % len(FILE_TYPES)]
+        fp = write_synthetic(data / _file_name(i, kind), kind, n_bytes)
+        entry: dict[str, Any] = {"path": fp.name, "description": f"Synthetic {kind}."}
+        if kind not in {"geojson", "png"}:
+            fields = [{"name": "value", "description": "Pseudo-random value."}]
+            entry["schema"] = {"fields": fields}
+        resources.append(entry)
+    additions = root / "_data" / "datapackage_additions.toml"
+    additions.write_text(
+        tomli_w.dumps({**PACKAGE_ADDITIONS, "resources": resources}), encoding="utf-8"
+    )
+    (root / "package.json").write_text(json.dumps(NPM_PACKAGE), encoding="utf-8")
+    return root
+
+
+@pytest.fixture(scope="session")
+def bench_bytes(request: pytest.FixtureRequest) -> int:
+    return request.config.getoption("--bench-bytes")
+
+
+@pytest.fixture(scope="session")
+def synthetic_repos(
+    tmp_path_factory: pytest.TempPathFactory, bench_bytes: int
+) -> Callable[[int], Path]:
+    """Lazily create (and reuse) one synthetic tree per number of resources."""
+    repos: dict[int, Path] = {}
+
+    def get(n_resources: int) -> Path:
+        if n_resources not in repos:
+            root = tmp_path_factory.mktemp(f"repo-n{n_resources}")
+            repos[n_resources] = make_repo(root, n_resources, bench_bytes)
+        return repos[n_resources]
+
+    return get
+
+
+@pytest.fixture
+def in_data_dir(
+    monkeypatch: pytest.MonkeyPatch, bdp: ModuleType
+) -> Callable[[Path], Path]:
+    """Mirror the state ``main`` sets up before inferring resources."""
+
+    def setup(repo: Path) -> Path:
+        data = repo / "data"
+        monkeypatch.chdir(data)
+        bases = bdp.identify_multi_format_datasets(data)
+        monkeypatch.setattr(bdp.ResourceAdapter, "multi_format_bases", bases)
+        return data
+
+    return setup
+
+
+@pytest.mark.parametrize("kind", FILE_TYPES)
+def test_from_path(
+    kind: str,
+    bench: Recorder,
+    bdp: ModuleType,
+    bench_bytes: int,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fp = write_synthetic(tmp_path / _file_name(0, kind), kind, bench_bytes)
+    monkeypatch.chdir(tmp_path)
+    result = bench(
+        "from_path",
+        lambda: bdp.ResourceAdapter.from_path(fp),
+        kind=kind,
+        bytes=fp.stat().st_size,
+    )
+    assert result["wall_min"] > 0
+
+
+def test_identify_multi_format_datasets(
+    n_resources: int,
+    bench: Recorder,
+    bdp: ModuleType,
+    synthetic_repos: Callable[[int], Path],
+) -> None:
+    data = synthetic_repos(n_resources) / "data"
+    bench(
+        "identify_multi_format_datasets",
+        lambda: bdp.identify_multi_format_datasets(data),
+        n_resources=n_resources,
+    )
+
+
+@pytest.mark.parametrize("n_fields", [10, 100, 1_000])
+def test_merge_schemas(n_fields: int, bench: Recorder, bdp: ModuleType) -> None:
+    import frictionless as fl  # noqa: PLC0415
+
+    names = [f"field_{i}" for i in range(n_fields)]
+    schema = fl.Schema.from_descriptor({
+        "fields": [{"name": name, "type": "integer"} for name in names]
+    })
+    resource = fl.Resource(name="wide", path="wide.csv", schema=schema)
+    extra = {"fields": [{"name": name, "description": name} for name in names[::2]]}
+    bench(
+        "merge_schemas",
+        lambda: bdp.merge_schemas(resource, extra=extra),
+        n_fields=n_fields,
+    )
+
+
+@pytest.mark.parametrize("method", ["to_json", "to_yaml", "to_markdown"])
+def test_package_serialize(
+    method: str,
+    n_resources: int,
+    bench: Recorder,
+    bdp: ModuleType,
+    synthetic_repos: Callable[[int], Path],
+    in_data_dir: Callable[[Path], Path],
+    tmp_path: Path,
+) -> None:
+    data = in_data_dir(synthetic_repos(n_resources))
+    digests = bdp.extract_digests(data)
+    resources = list(bdp.iter_resources(data, {}, digests))
+    pkg_meta = bdp.extract_package_metadata(NPM_PACKAGE, PACKAGE_ADDITIONS)
+    pkg = bdp.Package(resources=resources, **pkg_meta)
+    kwds = {"table": True} if method == "to_markdown" else {}
+    out = (tmp_path / f"datapackage.{method}").as_posix()
+    bench(
+        f"Package.{method}",
+        lambda: getattr(pkg, method)(out, **kwds),
+        n_resources=n_resources,
+    )
+
+
+@pytest.mark.parametrize("use_cache", [False, True], ids=["cold", "cached"])
+def test_main(
+    use_cache: bool,
+    n_resources: int,
+    bench: Recorder,
+    bdp: ModuleType,
+    synthetic_repos: Callable[[int], Path],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repo = synthetic_repos(n_resources)
+    monkeypatch.chdir(repo)
+    bench(
+        "main",
+        lambda: bdp.main(repo_dir=repo, use_cache=use_cache),
+        isolated=(
+            sys.executable,
+            "-c",
+            RUN_MAIN,
+            bdp.__file__,
+            str(repo),
+            str(int(use_cache)),
+        ),
+        n_resources=n_resources,
+        use_cache=use_cache,
+    )
+    descriptor = json.loads((repo / "datapackage.json").read_text(encoding="utf-8"))
+    assert len(descriptor["resources"]) == n_resources
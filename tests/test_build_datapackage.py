@@ -0,0 +1,328 @@
+"""
+Unit tests for ``scripts/build_datapackage.py``.
+
+Resources are inferred from small files written to ``tmp_path``, or from
+``data/`` when a real file shows the behavior best. Either way, the working
+directory is the one holding the file, as set up by ``main``.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import polars as pl
+import pytest
+import tomli_w
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+DATA = Path(__file__).resolve().parent.parent / "data"
+
+
+def infer(bdp: ModuleType, source: Path, /) -> Any:
+    """Infer ``source`` without any of the optional supplements."""
+    return bdp.ResourceAdapter.from_path(Path(source.name))
+
+
+def write_json_rows(fp: Path, rows: list[dict[str, Any]], /) -> Path:
+    fp.write_text(json.dumps(rows), encoding="utf-8")
+    return fp
+
+
+def late_floats(n_rows: int = 300, start: int = 200, /) -> list[dict[str, Any]]:
+    """Integers in the rows types are inferred from, then fractional values from ``start``."""
+    return [
+        {"id": i, "value": i if i < start else i + 0.5, "label": f"{i:05d}"}
+        for i in range(n_rows)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("name", "column"),
+    [("late-floats.json", "value"), ("cars.json", "Miles_per_Gallon")],
+)
+def test_stats_json_floats(
+    name: str,
+    column: str,
+    bdp: ModuleType,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    source = DATA / name
+    if name == "late-floats.json":
+        source = write_json_rows(tmp_path / name, late_floats())
+    monkeypatch.chdir(source.parent)
+    resource = bdp.ResourceAdapter.with_stats(infer(bdp, source), source)
+    rows = json.loads(source.read_text(encoding="utf-8"))
+    values = [row[column] for row in rows if row.get(column) is not None]
+    stats = resource.schema.get_field(column).custom["stats"]
+    assert resource.custom["rows"] == len(rows)
+    assert stats["nullCount"] == len(rows) - len(values)
+    assert (stats["min"], stats["max"]) == (min(values), max(values))
+
+
+@pytest.mark.parametrize("name", ["late-floats.json", "cars.json"])
+def test_preview_json_rows(
+    name: str, bdp: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = DATA / name
+    if name == "late-floats.json":
+        source = write_json_rows(tmp_path / name, late_floats())
+    monkeypatch.chdir(source.parent)
+    n = 50
+    monkeypatch.setattr(bdp.ResourceAdapter, "preview_rows", n)
+    resource = bdp.ResourceAdapter.with_preview(infer(bdp, source), source)
+    rows = json.loads(source.read_text(encoding="utf-8"))
+    preview = resource.custom["preview"]
+    assert preview["head"] == rows[:n]
+    assert len(preview["sample"]) == n
+    assert all(row in rows[n:] for row in preview["sample"])
+
+
+def write_csv_rows(fp: Path, rows: list[dict[str, Any]], /) -> Path:
+    lines = [",".join(rows[0]), *(",".join(map(str, row.values())) for row in rows)]
+    fp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return fp
+
+
+@pytest.fixture
+def streamed(bdp: ModuleType, monkeypatch: pytest.MonkeyPatch) -> Any:
+    """Infer and supplement a file as too large to read in full, in batches of 4 KiB."""
+    monkeypatch.setattr(bdp, "JSON_SNIFF_BYTES", 4 * 1024)
+
+    def supplement(source: Path, /) -> dict[str, Any]:
+        with monkeypatch.context() as m:
+            m.setattr(bdp.ResourceAdapter, "memory_budget", 1)
+            return supplement_all(bdp, infer(bdp, source), source)
+
+    return supplement
+
+
+def supplement_all(bdp: ModuleType, resource: Any, source: Path, /) -> dict[str, Any]:
+    adapter = bdp.ResourceAdapter
+    for fn in (adapter.with_stats, adapter.with_dtypes, adapter.with_preview):
+        resource = fn(resource, source)
+    return resource.to_dict()
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "late-floats.json",
+        "late-floats.csv",
+        "cars.json",
+        "seattle-weather.csv",
+        "budget.json",
+        "countries.json",
+    ],
+)
+def test_streamed_equals_full(
+    name: str,
+    bdp: ModuleType,
+    streamed: Any,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    source = DATA / name
+    if name == "late-floats.json":
+        source = write_json_rows(tmp_path / name, late_floats())
+    elif name == "late-floats.csv":
+        # NOTE: Past `POLARS_INFER_FULL_BYTES`, with the first float after `POLARS_INFER_ROWS`
+        source = write_csv_rows(tmp_path / name, late_floats(20_000, 1_500))
+    monkeypatch.chdir(source.parent)
+    full = supplement_all(bdp, infer(bdp, source), source)
+    batched = streamed(source)
+    assert batched["type"] == full["type"] == "table"
+    assert batched["rows"] == full["rows"]
+    assert batched["preview"] == full["preview"]
+    for expected, actual in zip(
+        full["schema"]["fields"], batched["schema"]["fields"], strict=True
+    ):
+        del expected["stats"]["approxDistinctCount"]
+        assert actual["stats"] == expected["stats"]
+        assert actual.get("dtype") == expected.get("dtype")
+
+
+def test_stats_csv_late_floats(
+    bdp: ModuleType, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rows = late_floats(20_000, 1_500)
+    source = write_csv_rows(tmp_path / "late-floats.csv", rows)
+    monkeypatch.chdir(tmp_path)
+    resource = supplement_all(bdp, infer(bdp, source), source)
+    stats = {field["name"]: field["stats"] for field in resource["schema"]["fields"]}
+    assert resource["rows"] == len(rows)
+    assert stats["value"]["max"] == rows[-1]["value"]
+
+
+def test_iter_csv_chunks_quoted_newlines(bdp: ModuleType, tmp_path: Path) -> None:
+    header = b"id,text\n"
+    records = [
+        f'{i},"line {i}\nstill ""{i}"",\r\nquoted"\n'.encode() for i in range(50)
+    ]
+    source = tmp_path / "quoted.csv"
+    source.write_bytes(header + b"".join(records))
+    for chunk_size in (1, 7, 64, 10_000):
+        first, *blocks = bdp.iter_csv_chunks(source, chunk_size)
+        assert first == header
+        assert b"".join(blocks) == b"".join(records)
+        for block in blocks:
+            frame = pl.read_csv(header + block)
+            assert frame.height == block.count(b"still")
+
+
+def test_iter_json_array_multibyte(bdp: ModuleType, tmp_path: Path) -> None:
+    rows = [
+        {"id": i, "name": f"Zürich {'日本語' * i} 🗺️", "value": i + 0.25}
+        for i in range(40)
+    ]
+    source = tmp_path / "multibyte.json"
+    source.write_text("\ufeff" + json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+    for chunk_size in (1, 2, 3, 5, 64, 10_000):
+        assert list(bdp.iter_json_array(source, chunk_size)) == rows
+
+
+def test_dtypes_cars_streamed(
+    bdp: ModuleType, streamed: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(DATA)
+    source = DATA / "cars.json"
+    full = supplement_all(bdp, infer(bdp, source), source)
+    batched = streamed(source)
+    dtypes = {field["name"]: field.get("dtype") for field in full["schema"]["fields"]}
+    assert {f["name"]: f.get("dtype") for f in batched["schema"]["fields"]} == dtypes
+    assert dtypes["Miles_per_Gallon"] in {"Float32", "Float64"}
+
+
+NPM_PACKAGE: dict[str, Any] = {
+    "name": "tiny",
+    "version": "0.0.0",
+    "repository": {"url": "https://example.com/tiny.git"},
+    "author": {"name": "Tests", "url": "https://example.com"},
+}
+
+
+def write_additions(
+    repo: Path, descriptions: dict[str, str], /, description: str = "Tiny datasets."
+) -> Path:
+    additions = {
+        "description": description,
+        "licenses": [{"name": "BSD-3-Clause", "path": "https://example.com/license"}],
+        "resources": [{"path": k, "description": v} for k, v in descriptions.items()],
+    }
+    fp = repo / "_data" / "datapackage_additions.toml"
+    fp.write_text(tomli_w.dumps(additions), encoding="utf-8")
+    return fp
+
+
+@pytest.fixture
+def tiny_repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A tree that ``main(repo_dir=...)`` can build, with two ``.csv`` files."""
+    for name in ("data", "_data", "src"):
+        (tmp_path / name).mkdir()
+    for name in ("a.csv", "b.csv"):
+        (tmp_path / "data" / name).write_text("x,y\n1,2\n3,4\n", encoding="utf-8")
+    write_additions(tmp_path, {"a.csv": "First.", "b.csv": "Second."})
+    (tmp_path / "package.json").write_text(json.dumps(NPM_PACKAGE), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def read_package(repo: Path, /) -> dict[str, Any]:
+    return json.loads((repo / "datapackage.json").read_text(encoding="utf-8"))
+
+
+def test_only_keeps_additions_hash(bdp: ModuleType, tiny_repo: Path) -> None:
+    bdp.main(repo_dir=tiny_repo)
+    built = read_package(tiny_repo)
+    additions = write_additions(tiny_repo, {"a.csv": "Edited.", "b.csv": "Second."})
+    bdp.main(repo_dir=tiny_repo, only=["b.csv"])
+    partial = read_package(tiny_repo)
+    assert partial["resources"][0]["description"] == "First."
+    assert partial["additionsHash"] == built["additionsHash"]
+    assert partial["additionsHash"] != bdp.additions_hash(additions)
+    bdp.main(repo_dir=tiny_repo)
+    rebuilt = read_package(tiny_repo)
+    assert rebuilt["resources"][0]["description"] == "Edited."
+    assert rebuilt["additionsHash"] == bdp.additions_hash(additions)
+
+
+@pytest.fixture
+def watcher(bdp: ModuleType, tiny_repo: Path) -> Any:
+    bdp.main(repo_dir=tiny_repo)
+    return bdp.Watcher(
+        tiny_repo,
+        NPM_PACKAGE,
+        bdp.Package(read_package(tiny_repo)),
+        bdp.extract_digests(tiny_repo / "data"),
+        cache=bdp.InferenceCache(tiny_repo / "_data" / "resources.json"),
+    )
+
+
+def test_watch_package_additions(bdp: ModuleType, watcher: Any) -> None:
+    assert watcher.scan() is None
+    descriptions = {"a.csv": "First.", "b.csv": "Second."}
+    additions = write_additions(watcher.repo_dir, descriptions, "Edited datasets.")
+    touched = watcher.scan()
+    assert touched == set()
+    watcher.rebuild(touched)
+    rebuilt = read_package(watcher.repo_dir)
+    assert rebuilt["description"] == "Edited datasets."
+    assert rebuilt["additionsHash"] == bdp.additions_hash(additions)
+
+
+def test_watch_invalid_additions(bdp: ModuleType, watcher: Any) -> None:
+    additions = watcher.repo_dir / "_data" / "datapackage_additions.toml"
+    valid = additions.read_text(encoding="utf-8")
+    additions.write_text(valid[: len(valid) // 2] + '"\n', encoding="utf-8")
+    assert watcher.scan() is None
+    additions.write_text(valid.replace("First.", "Edited."), encoding="utf-8")
+    assert watcher.scan() == {"a.csv"}
+
+
+def test_resource_spans_earlier_key(bdp: ModuleType) -> None:
+    package = {
+        "description": 'Not a key: "resources": [',
+        "sources": [{"title": "Nested", "resources": [{"name": "z"}]}],
+        "resources": [{"name": "a", "title": "Ünïcode"}, {"name": "b"}],
+    }
+    data = json.dumps(package, indent=2, ensure_ascii=False).encode()
+    spans = list(bdp._iter_resource_spans(data.decode()))
+    members = [json.loads(data[i : i + n]) for i, n in spans]
+    assert members == package["resources"]
+
+
+@pytest.mark.parametrize(
+    ("name", "column", "fmt"),
+    [("cars.json", "Year", None), ("stocks.csv", "date", "%b %d %Y")],
+)
+def test_stats_temporal_strings(
+    name: str,
+    column: str,
+    fmt: str | None,
+    bdp: ModuleType,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    source = DATA / name
+    monkeypatch.chdir(DATA)
+    resource = infer(bdp, source)
+    resource.schema.set_field_type(column, "date")
+    resource.schema.get_field(column).format = fmt or "default"
+    resource = bdp.ResourceAdapter.with_stats(resource, source)
+    stats = resource.schema.get_field(column).custom["stats"]
+    frame = pl.read_json(source) if name.endswith(".json") else pl.read_csv(source)
+    values = frame.get_column(column).str.to_date(fmt)
+    assert stats["min"] == values.min().isoformat()  # type: ignore[union-attr]
+    assert stats["max"] == values.max().isoformat()  # type: ignore[union-attr]
+
+
+@pytest.mark.parametrize("jobs", ["0", "-1", "two"])
+def test_parse_args_jobs_invalid(
+    bdp: ModuleType, jobs: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit):
+        bdp.parse_args(["--jobs", jobs])
+    assert "expected a positive integer" in capsys.readouterr().err
@@ -4,20 +4,28 @@ Validate every resource in datapackage.json against its on-disk file.
 Two tiers:
 
 * Default — stdlib-only file existence, byte size, and git-blob SHA-1
-  against the descriptor. Sub-second across all 70+ resources. Covers
-  what frictionless-py doesn't today (byte-count returns ``None`` for
-  tabular JSON / arrow / parquet; hash-count supports only md5 and
-  sha256, descriptor uses sha1).
+  against the descriptor. Sub-second across all 70+ resources, as
+  digests are streamed and computed once per session across threads
+  (the ``blob_sha1s`` fixture). Covers what frictionless-py doesn't
+  today (byte-count returns ``None`` for tabular JSON / arrow /
+  parquet; hash-count supports only md5 and sha256, descriptor uses
+  sha1).
 
 * Slow (``pytest --runslow``) — frictionless schema and row validation
   per resource. Multi-minute on flights-3m at full read; opt in via the
   ``--runslow`` flag and pass ``--limit-rows N`` to cap row reads
-  during iteration. Default is full read.
+  during iteration. Default is full read. Pass ``--validator polars``
+  for the column-wise equivalent in ``polars_validator.py``, which
+  reports errors in the same shape within seconds. A resource that
+  passed a previous full run is skipped while its file, descriptor
+  and validator are unchanged (``validation_cache``); pass
+  ``--no-cache`` to re-validate everything.
 
 Resources whose schema/row check is known-broken upstream (``movies``
 documented pedagogy; ``flights_200k_arrow`` no upstream parser) are
 listed in ``_data/validate_datapackage.toml`` and marked
-``xfail(strict=True)`` at parametrize time. Removing an entry
+``xfail(strict=True)`` at parametrize time, optionally only for the
+``validators`` an entry names. Removing an entry
 re-enables strict checking; if the upstream issue resolves, the run
 flips XFAIL → XPASS and fails, prompting allowlist removal.
 """
@@ -27,10 +35,13 @@ from __future__ import annotations
 import hashlib
 import json
 import tomllib
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from importlib import metadata
 from pathlib import Path
 from typing import Any
 
+import polars_validator
 import pytest
 from frictionless import Checklist, Package
 
@@ -38,26 +49,25 @@ REPO = Path(__file__).resolve().parent.parent
 DATA = REPO / "data"
 DESCRIPTOR_PATH = REPO / "datapackage.json"
 ALLOWLIST_PATH = REPO / "_data" / "validate_datapackage.toml"
+CHUNK_SIZE = 1024 * 1024
+VALIDATION_CACHE_KEY = "vega-datasets/validated"
 
 
 def _load_resources() -> list[dict]:
     return json.loads(DESCRIPTOR_PATH.read_text(encoding="utf-8"))["resources"]
 
 
-def _load_xfail_reasons() -> dict[str, str]:
-    """Read the allowlist; xfail reason is the first non-empty line of `reason`."""
+def _load_xfail_entries() -> dict[str, dict[str, Any]]:
+    """Read the allowlist, keyed by resource name."""
     if not ALLOWLIST_PATH.exists():
         return {}
     cfg = tomllib.loads(ALLOWLIST_PATH.read_text(encoding="utf-8"))
-    return {
-        entry["resource"]: entry["reason"].strip().splitlines()[0]
-        for entry in cfg.get("expected_failures", [])
-    }
+    return {entry["resource"]: entry for entry in cfg.get("expected_failures", [])}
 
 
 _RESOURCES = _load_resources()
 _RESOURCE_IDS = [r["name"] for r in _RESOURCES]
-_XFAIL = _load_xfail_reasons()
+_XFAIL = _load_xfail_entries()
 
 # Sanity-check the allowlist against the live descriptor at import time.
 # A stale entry in validate_datapackage.toml is a silent maintenance hazard
@@ -73,9 +83,26 @@ if _unknown_xfail:
 
 
 def git_blob_sha1(path: Path) -> str:
-    r"""Compute git's blob SHA-1: ``sha1(b"blob {len}\0" + content)``."""
-    content = path.read_bytes()
-    return hashlib.sha1(b"blob %d\0%b" % (len(content), content)).hexdigest()
+    r"""Compute git's blob SHA-1: ``sha1(b"blob {len}\0" + content)``, in fixed-size chunks."""
+    with path.open("rb") as f:
+        digest = hashlib.sha1(b"blob %d\0" % path.stat().st_size)
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@pytest.fixture(scope="session")
+def blob_sha1s() -> dict[str, str]:
+    """
+    Git blob SHA-1 of every existing resource file, keyed by ``path``.
+
+    Computed once per session across a thread pool; ``hashlib`` releases the
+    GIL while hashing, so large files are hashed in parallel.
+    """
+    paths = sorted({r["path"] for r in _RESOURCES if (DATA / r["path"]).exists()})
+    with ThreadPoolExecutor() as pool:
+        digests = pool.map(git_blob_sha1, (DATA / path for path in paths))
+        return dict(zip(paths, digests, strict=True))
 
 
 @pytest.mark.parametrize("resource", _RESOURCES, ids=_RESOURCE_IDS)
@@ -103,7 +130,7 @@ def test_bytes_match(resource: dict) -> None:
 
 
 @pytest.mark.parametrize("resource", _RESOURCES, ids=_RESOURCE_IDS)
-def test_sha1_matches_git_blob(resource: dict) -> None:
+def test_sha1_matches_git_blob(resource: dict, blob_sha1s: dict[str, str]) -> None:
     """
     Catch on-disk edits where `hash` in the descriptor wasn't regenerated.
 
@@ -116,27 +143,78 @@ def test_sha1_matches_git_blob(resource: dict) -> None:
         f"descriptor regression: hash format not sha1 for {resource['name']!r}: "
         f"{declared!r}"
     )
-    path = DATA / resource["path"]
-    if not path.exists():
+    if resource["path"] not in blob_sha1s:
         pytest.skip(f"file missing — see test_file_exists[{resource['name']}]")
     expected = declared.removeprefix("sha1:")
-    actual = git_blob_sha1(path)
+    actual = blob_sha1s[resource["path"]]
     assert expected == actual, f"declared={expected[:10]}... disk={actual[:10]}..."
 
 
 def _slow_param(resource: dict) -> Any:  # pytest.ParameterSet; not in public API
-    """Build the parametrize entry for the slow tier; attach xfail strict if allowlisted."""
+    """
+    Build the parametrize entry for the slow tier; attach xfail strict if allowlisted.
+
+    The xfail reason is the first non-empty line of `reason`. Entries listing
+    `validators` only apply when ``--validator`` is one of them.
+    """
     name = resource["name"]
     marks = []
-    if name in _XFAIL:
-        marks = [pytest.mark.xfail(reason=_XFAIL[name], strict=True)]
+    if entry := _XFAIL.get(name):
+        reason = entry["reason"].strip().splitlines()[0]
+        condition = True
+        if validators := entry.get("validators"):
+            condition = f"config.getoption('--validator') in {validators!r}"
+        marks = [pytest.mark.xfail(condition, reason=reason, strict=True)]
     return pytest.param(resource, id=name, marks=marks)
 
 
-@pytest.mark.slow
-@pytest.mark.parametrize("resource", [_slow_param(r) for r in _RESOURCES])
-def test_schema_and_rows(resource: dict, schema_limit_rows: int | None) -> None:
-    """Validate column types and row content via frictionless."""
+def _failure_lines(task_errors: list[Any], package_errors: list[Any]) -> list[str]:
+    """Render the first few errors of either validator, one per line."""
+    lines: list[str] = []
+    for err in task_errors[:5]:
+        field = getattr(err, "field_name", None)
+        lines.append(f"{err.type} field={field!r}: {err.note}")
+    if len(task_errors) > 5:
+        lines.append(f"  (+{len(task_errors) - 5} more)")
+    for err in package_errors[:5]:
+        lines.append(f"package-level {err.type}: {err.note}")
+    return lines
+
+
+def _validation_key(resource: dict, blob_sha1: str, validator: str) -> str:
+    """
+    Digest of everything a passing ``test_schema_and_rows`` result depends on.
+
+    Covers the file (by blob SHA-1), the resource descriptor (schema, dialect,
+    format, ...) and the version of the validator.
+    """
+    if validator == "polars":
+        version = hashlib.sha1(Path(polars_validator.__file__).read_bytes()).hexdigest()
+        versions = [metadata.version("polars"), version]
+    else:
+        versions = [metadata.version("frictionless")]
+    parts = [resource["name"], blob_sha1, resource, validator, versions]
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+@pytest.fixture(scope="session")
+def validation_cache(request: pytest.FixtureRequest) -> pytest.Cache | None:
+    """
+    ``_validation_key`` of each resource that last passed ``test_schema_and_rows``.
+
+    Persisted in pytest's cache (``.pytest_cache/``). Each resource has its own
+    entry, written as soon as it passes, so that ``pytest-xdist`` workers don't
+    overwrite each other's results. Cleared by ``--cache-clear``. ``None`` when
+    disabled by ``--no-cache``.
+    """
+    config = request.config
+    if config.getoption("--no-cache") or not hasattr(config, "cache"):
+        return None
+    return config.cache
+
+
+def _validate_frictionless(resource: dict, limit_rows: int | None) -> str | None:
+    """Validate column types and row content via frictionless; describe any failure."""
     # parallel=False is load-bearing: frictionless's parallel code path silently
     # ignores Checklist.skip_errors, which would re-surface byte-count and
     # hash-count errors that phase 1 already covers more completely. Don't
@@ -145,21 +223,73 @@ def test_schema_and_rows(resource: dict, schema_limit_rows: int | None) -> None:
     # basepath workaround: descriptor paths are bare filenames under data/ (see #758).
     package = Package({"resources": [deepcopy(resource)]}, basepath=str(DATA))
     report = package.validate(
-        checklist=checklist, limit_rows=schema_limit_rows, parallel=False
+        checklist=checklist, limit_rows=limit_rows, parallel=False
     )
     if report.valid:
-        return
+        return None
 
     # Failure rendering — guarded against empty tasks (frictionless can return
     # package-level errors without per-task entries).
-    lines: list[str] = []
-    if report.tasks:
-        task_errors = report.tasks[0].errors
-        for err in task_errors[:5]:
-            field = getattr(err, "field_name", None)
-            lines.append(f"{err.type} field={field!r}: {err.note}")
-        if len(task_errors) > 5:
-            lines.append(f"  (+{len(task_errors) - 5} more)")
-    for err in list(getattr(report, "errors", []) or [])[:5]:
-        lines.append(f"package-level {err.type}: {err.note}")
-    pytest.fail("\n".join(lines) or f"validation failed (no error details): {report!r}")
+    task_errors = report.tasks[0].errors if report.tasks else []
+    package_errors = list(getattr(report, "errors", []) or [])
+    lines = _failure_lines(task_errors, package_errors)
+    return "\n".join(lines) or f"validation failed (no error details): {report!r}"
+
+
+def _validate_polars(resource: dict, limit_rows: int | None) -> str | None:
+    """
+    Validate column types and row content via polars; describe any failure.
+
+    Resources using a type, format or constraint that ``polars_validator`` does
+    not support are validated via frictionless instead.
+    """
+    try:
+        errors = polars_validator.validate_resource(
+            resource, DATA, limit_rows=limit_rows
+        )
+    except polars_validator.UnsupportedField:
+        return _validate_frictionless(resource, limit_rows)
+    return "\n".join(_failure_lines(errors, [])) if errors else None
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("resource", [_slow_param(r) for r in _RESOURCES])
+def test_schema_and_rows(
+    resource: dict,
+    schema_limit_rows: int | None,
+    validator: str,
+    blob_sha1s: dict[str, str],
+    validation_cache: pytest.Cache | None,
+) -> None:
+    """
+    Validate column types and row content via frictionless (or polars).
+
+    Skipped when the resource passed a previous full run and nothing it depends
+    on has changed, see ``validation_cache``. Partial (``--limit-rows``) and
+    allowlisted resources are never cached.
+    """
+    name = resource["name"]
+    cache_key = f"{VALIDATION_CACHE_KEY}/{name}"
+    key = None
+    if (
+        validation_cache is not None
+        and schema_limit_rows is None
+        and name not in _XFAIL
+        and (blob_sha1 := blob_sha1s.get(resource["path"]))
+    ):
+        key = _validation_key(resource, blob_sha1, validator)
+        if validation_cache.get(cache_key, None) == key:
+            pytest.skip("unchanged since it last passed, re-run with --no-cache")
+
+    validate = _validate_polars if validator == "polars" else _validate_frictionless
+    if failure := validate(resource, schema_limit_rows):
+        pytest.fail(failure)
+    if validation_cache is not None and key is not None:
+        validation_cache.set(cache_key, key)
+
+
+def test_validate_polars_unsupported() -> None:
+    """Resources ``polars_validator`` can't check are validated via frictionless."""
+    resource = deepcopy(next(r for r in _RESOURCES if r["name"] == "seattle_weather"))
+    resource["schema"]["fields"][0] |= {"type": "date", "format": "any"}
+    assert _validate_polars(resource, 10) == _validate_frictionless(resource, 10)